@@ -1,5 +1,5 @@
 from dirutility.backup import ZipBackup
-from dirutility.ftp import FTP
+from dirutility.ftp import FTP, FTPPool
 from dirutility.move import FlattenTree, CreateTree, move_files_to_folders
 from dirutility.multiprocess import pool_process, PoolProcess
 from dirutility.permissions import Permissions
@@ -12,5 +12,6 @@ from dirutility.dump import TextDump
 
 __all__ = [
     'FlattenTree', 'CreateTree', 'move_files_to_folders', 'DirTree', 'DirPaths', 'desktop', 'ZipBackup', 'FTP',
-    'open_window', 'Permissions', 'pool_process', 'SystemCommand', 'PoolProcess', 'Versions', 'Hash', 'TextDump'
+    'FTPPool', 'open_window', 'Permissions', 'pool_process', 'SystemCommand', 'PoolProcess', 'Versions', 'Hash',
+    'TextDump'
 ]
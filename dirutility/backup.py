@@ -1,16 +1,203 @@
 # Copies an entire folder and its contents into a zip file whose filename increments.
+import json
 import os
 import shutil
-from zipfile import ZipFile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import cpu_count
+from queue import Queue
+from threading import Thread
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
 
 from tqdm import tqdm
 
+from dirutility.open.index import index_zip
+from dirutility.open.zipwrite import append_compressed
 from dirutility.walk import DirPaths
+from dirutility.walk.result import WalkResult
+
+# Name of the member holding the manifest of an incremental backup
+MANIFEST = '.dirutility_manifest.json'
+MANIFEST_VERSION = 1
+
+# Extensions of file formats that are already compressed, members with these extensions are stored by adaptive backups
+STORED_EXTENSIONS = {
+    '.7z', '.aac', '.apk', '.avi', '.bz2', '.docx', '.epub', '.flac', '.gif', '.gz', '.heic', '.jar', '.jpeg', '.jpg',
+    '.lz4', '.lzma', '.m4a', '.m4v', '.mkv', '.mov', '.mp3', '.mp4', '.odt', '.ogg', '.opus', '.png', '.pptx', '.rar',
+    '.tgz', '.txz', '.webm', '.webp', '.whl', '.xlsx', '.xz', '.zip', '.zst'
+}
+
+# Size of the leading block compressed to judge whether a file is worth deflating
+SAMPLE_SIZE = 64 * 1024
+
+# Files whose sample compresses to more than this fraction of its size are stored by adaptive backups
+SAMPLE_RATIO = 0.9
+
+# Maximum number of walked directory batches buffered ahead of the writer by streaming backups
+STREAM_QUEUE = 64
+
+# Files larger than this are written by the writer thread in a streaming fashion instead of being compressed in memory
+LARGE_FILE = 64 * 1024 ** 2
+
+
+def choose_compression(file_path, sample=None):
+    """
+    Choose whether a file should be deflated or stored.
+
+    Files with extensions of already compressed formats are stored, otherwise the leading block of the file is
+    compressed at the fastest level and the file is stored if the block does not shrink by at least 10%.
+
+    :param file_path: File path
+    :param sample: Leading bytes of the file, read from file_path when not given
+    :return: Tuple (compress_type, reason), reason is 'deflated', 'stored_extension' or 'stored_sample'
+    """
+    if os.path.splitext(file_path)[1].lower() in STORED_EXTENSIONS:
+        return ZIP_STORED, 'stored_extension'
+    if sample is None:
+        with open(file_path, 'rb') as fp:
+            sample = fp.read(SAMPLE_SIZE)
+    sample = sample[:SAMPLE_SIZE]
+    if sample and len(zlib.compress(sample, 1)) > len(sample) * SAMPLE_RATIO:
+        return ZIP_STORED, 'stored_sample'
+    return ZIP_DEFLATED, 'deflated'
+
+
+def compress_member(file_path, arcname, compress_type, compress_level, adaptive=False):
+    """
+    Read and compress a file into a zip member without touching the zip file.
+
+    :param file_path: Path of the file to compress
+    :param arcname: Name of the member within the archive
+    :param compress_type: ZIP_DEFLATED or ZIP_STORED
+    :param compress_level: zlib compression level
+    :param adaptive: Bool, when true incompressible files are stored instead of deflated
+    :return: Tuple (ZipInfo, compressed data, reason), data is None for files larger than LARGE_FILE and reason is
+    the choose_compression reason or None when the compression was not chosen adaptively
+    """
+    zinfo = ZipInfo.from_file(file_path, arcname)
+    zinfo.compress_type = compress_type
+    adaptive = adaptive and compress_type == ZIP_DEFLATED
+    reason = None
+    if zinfo.file_size > LARGE_FILE:
+        if adaptive:
+            zinfo.compress_type, reason = choose_compression(file_path)
+        return zinfo, None, reason
+
+    with open(file_path, 'rb') as fp:
+        data = fp.read()
+    if adaptive:
+        zinfo.compress_type, reason = choose_compression(file_path, data[:SAMPLE_SIZE])
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    if zinfo.compress_type == ZIP_DEFLATED:
+        # Raw deflate stream (no zlib header or checksum) as stored in zip files
+        compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -15)
+        data = compressor.compress(data) + compressor.flush()
+    zinfo.compress_size = len(data)
+    return zinfo, data, reason
+
+
+def read_manifest(zip_filename):
+    """Return the manifest of an incremental backup or None if the archive does not contain one."""
+    with ZipFile(zip_filename) as backup_zip:
+        if MANIFEST not in backup_zip.NameToInfo:
+            return None
+        return json.loads(backup_zip.read(MANIFEST))
+
+
+def restore(zip_filename, destination):
+    """
+    Restore a backup to a destination directory.
+
+    Incremental backups are restored to the state recorded by their manifest, each file is extracted from the
+    archive within the backup chain that holds its latest version.  Archives of the chain are expected to be in
+    the same directory as zip_filename.
+
+    :param zip_filename: Backup zip file path, the latest backup of an incremental series
+    :param destination: Directory to restore files to
+    :return: List of restored file paths
+    """
+    manifest = read_manifest(zip_filename)
+    if manifest is None:
+        with ZipFile(zip_filename) as backup_zip:
+            backup_zip.extractall(destination)
+            return [os.path.join(destination, name) for name in backup_zip.namelist()]
+
+    # Group members by the archive holding them so each archive is opened once
+    archives = {}
+    for arcname, (size, mtime_ns, crc, archive) in manifest['files'].items():
+        archives.setdefault(archive, []).append(arcname)
+
+    restored = []
+    for archive, members in archives.items():
+        with ZipFile(os.path.join(os.path.dirname(zip_filename), archive)) as backup_zip:
+            for arcname in members:
+                restored.append(backup_zip.extract(arcname, destination))
+                os.utime(restored[-1], ns=(manifest['files'][arcname][1], manifest['files'][arcname][1]))
+    return restored
+
+
+class PathStream:
+
+    def __init__(self, source, maxsize=STREAM_QUEUE):
+        """
+        Iterable of the file paths within a directory walked by a background thread.
+
+        Batches of paths are passed through a bounded queue so paths can be consumed while the walk is still running
+        and at most maxsize batches are held in memory.  The number of paths found so far is kept in found, and when
+        a progress bar is attached its total is raised to match as paths are consumed.
+
+        :param source: Directory to walk
+        :param maxsize: Maximum number of batches buffered in the queue
+        """
+        self.found = 0
+        self.progress = None
+        self._queue = Queue(maxsize)
+        self._thread = Thread(target=self._walk, args=(source, ), daemon=True)
+        self._thread.start()
+
+    def _walk(self, source):
+        try:
+            for batch in DirPaths(source, full_paths=True).iter_walk(batch=True):
+                self.found += len(batch)
+                self._queue.put(batch)
+        except Exception as e:
+            self._queue.put(e)
+        finally:
+            self._queue.put(None)
+
+    def __iter__(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                if self.progress is not None:
+                    self.progress.total = self.found
+                    self.progress.refresh()
+                break
+            if isinstance(batch, Exception):
+                raise batch
+            for path in batch:
+                if self.progress is not None and self.progress.total != self.found:
+                    self.progress.total = self.found
+                    self.progress.refresh()
+                yield path
 
 
 class ZipBackup:
 
-    def __init__(self, source, destination=None, compress_level=0, delete_source=False, overwrite=False):
+    def __init__(self,
+                 source,
+                 destination=None,
+                 compress_level=0,
+                 delete_source=False,
+                 overwrite=False,
+                 parallelize=False,
+                 pool_size=cpu_count(),
+                 incremental=False,
+                 adaptive=False,
+                 stream=False,
+                 index=False):
         """
         Create zip file backup of a directory.
 
@@ -20,10 +207,29 @@ class ZipBackup:
 
         :param source: Source folder path or iterable of paths
         :param destination: Defaults source parent directory
-        :param compress_level: Compression level
+        :param compress_level: Compression level, files are deflated when greater than 0 and stored otherwise
+        :param parallelize: Bool, when true files are compressed concurrently by a pool of threads
+        :param pool_size: Number of compression threads
+        :param incremental: Bool, when true only files added or changed since the previous backup in the series are
+        written along with a manifest of every file, use restore() to reconstruct the source from the series
+        :param adaptive: Bool, when true files that are already compressed (by extension or by compressing a sample of
+        their first block) are stored instead of deflated, the number of files of each choice is reported in stats
+        :param stream: Bool, when true files are written as a background thread walks the source instead of after the
+        walk completes, the progress bar total grows as files are found.  Incremental backups walk the source up front
+        :param index: Bool, when true an index sidecar of member offsets is written next to the zip file, read members
+        with dirutility.open.ArchiveIndex
         """
-        # TODO: Add multiprocessing support
+        if incremental and overwrite:
+            raise ValueError("incremental backups can't overwrite the previous backup in the series")
         self.compress_level = compress_level
+        self.compression = ZIP_DEFLATED if compress_level else ZIP_STORED
+        self.parallelize = parallelize
+        self.pool_size = pool_size
+        self.incremental = incremental
+        self.adaptive = adaptive
+        self.stream = stream
+        self.index = index
+        self.stats = dict.fromkeys(('deflated', 'stored', 'stored_extension', 'stored_sample'), 0)
         self.delete_source = delete_source
         self.overwrite = overwrite
         self.source, self.zip_filename = self._set_paths(source, destination)
@@ -68,14 +274,121 @@ class ZipBackup:
         return source, zip_filename
 
     def _get_paths(self):
-        return DirPaths(self.source, full_paths=True).walk()
+        if self.stream and not self.incremental:
+            return PathStream(self.source)
+        return DirPaths(self.source, full_paths=True).walk(stat=self.incremental)
+
+    @staticmethod
+    def _progress(dirs):
+        """Return a tqdm progress bar for writing a list of paths or a PathStream."""
+        if isinstance(dirs, PathStream):
+            dirs.progress = tqdm(desc='Writing Zip Files', total=dirs.found)
+            return dirs.progress
+        return tqdm(desc='Writing Zip Files', total=len(dirs))
+
+    def _arcname(self, path):
+        return path[len(self.source):].lstrip(os.sep).replace(os.sep, '/')
+
+    def _previous_archive(self):
+        """Return the file path of the backup preceding this one in the series or None if this is the first."""
+        head, number = os.path.splitext(self.zip_filename)[0], 0
+        base = os.path.join(os.path.dirname(self.zip_filename), os.path.basename(self.source))
+        if head != base:
+            number = int(head[len(base) + 1:])
+        if number == 0:
+            return None
+        return base + ('_' + str(number - 1) if number > 1 else '') + '.zip'
+
+    def _changed_paths(self, paths):
+        """
+        Return the paths added or changed since the previous backup along with the manifest for this backup.
+
+        Files are compared to the previous manifest by size and mtime.  Unchanged files keep the reference to the
+        archive holding them, changed files reference this archive until their checksums are added after writing.
+        """
+        if not isinstance(paths, WalkResult):
+            result = WalkResult()
+            for path in paths:
+                result.append(path, os.stat(path))
+            paths = result
+
+        previous = self._previous_archive()
+        manifest = read_manifest(previous) if previous and os.path.exists(previous) else None
+        previous_files = manifest['files'] if manifest else {}
+
+        files, changed = {}, []
+        archive = os.path.basename(self.zip_filename)
+        for path, size, mtime_ns in zip(paths.paths, paths.size, paths.mtime_ns):
+            arcname = self._arcname(path)
+            old = previous_files.get(arcname)
+            if old and old[0] == size and old[1] == mtime_ns:
+                files[arcname] = old
+            else:
+                files[arcname] = [size, mtime_ns, None, archive]
+                changed.append(path)
+
+        manifest = {'version': MANIFEST_VERSION, 'previous': os.path.basename(previous) if manifest else None,
+                    'files': files}
+        return changed, manifest
+
+    def _write_manifest(self, manifest):
+        """Append the manifest to the backup, recording the CRC32 of every file written to this backup."""
+        with ZipFile(self.zip_filename, 'a') as backup_zip:
+            for zinfo in backup_zip.infolist():
+                manifest['files'][zinfo.filename][2] = zinfo.CRC
+            backup_zip.writestr(MANIFEST, json.dumps(manifest, separators=(',', ':')), compress_type=ZIP_DEFLATED)
+
+    def _record(self, compress_type, reason=None):
+        """Count the compression chosen for a member in stats."""
+        self.stats['deflated' if compress_type == ZIP_DEFLATED else 'stored'] += 1
+        if reason and reason != 'deflated':
+            self.stats[reason] += 1
 
     def _backup_compresslevel(self, dirs):
         """Create a backup file with a compresslevel parameter."""
         # Only supported in Python 3.7+
-        with ZipFile(self.zip_filename, 'w', compresslevel=self.compress_level) as backup_zip:
-            for path in tqdm(dirs, desc='Writing Zip Files', total=len(dirs)):
-                backup_zip.write(path, path[len(self.source):len(path)])
+        with ZipFile(self.zip_filename, 'w', compression=self.compression,
+                     compresslevel=self.compress_level) as backup_zip, self._progress(dirs) as pbar:
+            for path in dirs:
+                compress_type, reason = self.compression, None
+                if self.adaptive and self.compression == ZIP_DEFLATED:
+                    compress_type, reason = choose_compression(path)
+                backup_zip.write(path, path[len(self.source):len(path)], compress_type=compress_type)
+                self._record(compress_type, reason)
+                pbar.update()
+
+    def _backup_parallel(self, dirs):
+        """
+        Create a backup by compressing files concurrently within a pool of threads.
+
+        zlib releases the GIL while compressing and computing checksums so threads scale with cores.  A single writer
+        appends the precompressed members in order, keeping a bounded number of files in flight.  Files larger than
+        LARGE_FILE are compressed by the writer using ZipFile.write.
+        """
+        max_pending = self.pool_size * 2
+        pending = deque()
+        paths = iter(dirs)
+        with ZipFile(self.zip_filename, 'w', compression=self.compression,
+                     compresslevel=self.compress_level) as backup_zip, ThreadPoolExecutor(self.pool_size) as executor:
+            with self._progress(dirs) as pbar:
+                while True:
+                    # Keep the pool busy with the next files while the oldest member is written
+                    for path in paths:
+                        pending.append((path, executor.submit(compress_member, path, path[len(self.source):],
+                                                              self.compression, self.compress_level, self.adaptive)))
+                        if len(pending) >= max_pending:
+                            break
+                    if not pending:
+                        break
+
+                    path, future = pending.popleft()
+                    zinfo, data, reason = future.result()
+                    if data is None:
+                        backup_zip.write(path, zinfo.filename, compress_type=zinfo.compress_type)
+                    else:
+                        append_compressed(backup_zip, [(zinfo, data)])
+                    self._record(zinfo.compress_type, reason)
+                    pbar.update()
 
     def _backup_pb_gui(self, dirs):
         """Create a zip backup with a GUI progress bar."""
@@ -98,6 +411,27 @@ class ZipBackup:
         if not paths:
             paths = self._get_paths()
 
+        if self.incremental:
+            paths, manifest = self._changed_paths(paths)
+
+        if self.parallelize:
+            self._backup_parallel(paths)
+        else:
+            self._backup(paths)
+
+        if self.incremental:
+            self._write_manifest(manifest)
+
+        if self.index:
+            index_zip(self.zip_filename)
+
+        # Delete source if specified
+        if self.delete_source:
+            shutil.rmtree(self.source)
+        return self.zip_filename
+
+    def _backup(self, paths):
+        """Create a backup in sequence."""
         try:
             self._backup_compresslevel(paths)
         except TypeError:
@@ -106,11 +440,6 @@ class ZipBackup:
             except ImportError:
                 self._backup_pb_tqdm(paths)
 
-        # Delete source if specified
-        if self.delete_source:
-            shutil.rmtree(self.source)
-        return self.zip_filename
-
 
 def main():
     try:
@@ -1,6 +1,10 @@
-from tqdm import tqdm
+import os
+from functools import partial
 
-from dirutility import DirPaths
+from dirutility import DirPaths, PoolProcess
+from dirutility.hash import FAST_ALGORITHM, Hash
+
+MODES = ('path', 'content')
 
 
 def unique(list1, list2):
@@ -9,8 +13,7 @@ def unique(list1, list2):
     :return: Unique items only in list 1
     """
     set2 = set(list2)
-    list1_unique = [x for x in tqdm(list1, desc='Unique', total=len(list1)) if x not in set2]
-    return list1_unique
+    return [x for x in list1 if x not in set2]
 
 
 def unique_venn(list1, list2):
@@ -18,8 +21,63 @@ def unique_venn(list1, list2):
     return unique(list1, list2), unique(list2, list1)
 
 
-def compare_trees(dir1, dir2):
-    """Parse two directories and return lists of unique files"""
+def same_content(pair, algo=FAST_ALGORITHM):
+    """Return a (relative_path, bool) tuple indicating whether two files have identical hashes."""
+    relative_path, path1, path2 = pair
+    return relative_path, Hash.from_file(path1, algo) == Hash.from_file(path2, algo)
+
+
+def compare_contents(dir1, dir2, algo=FAST_ALGORITHM):
+    """
+    Compare the contents of two directories.
+
+    Files present in both trees are considered unchanged when their size and modification time match and modified
+    when their sizes differ, without reading either file.  Only the remaining ambiguous pairs are hashed, in parallel.
+
+    :param dir1: Original directory
+    :param dir2: New directory
+    :param algo: Hashing algorithm used to compare ambiguous files
+    :return: Dictionary of 'added', 'removed', 'modified' and 'unchanged' sets of relative paths
+    """
+    paths1 = set(DirPaths(dir1, engine='scandir').walk())
+    paths2 = set(DirPaths(dir2, engine='scandir').walk())
+    result = {
+        'added': paths2 - paths1,
+        'removed': paths1 - paths2,
+        'modified': set(),
+        'unchanged': set(),
+    }
+
+    ambiguous = []
+    for path in paths1 & paths2:
+        stat1, stat2 = os.stat(os.path.join(dir1, path)), os.stat(os.path.join(dir2, path))
+        if stat1.st_size != stat2.st_size:
+            result['modified'].add(path)
+        elif stat1.st_mtime_ns == stat2.st_mtime_ns:
+            result['unchanged'].add(path)
+        else:
+            ambiguous.append((path, os.path.join(dir1, path), os.path.join(dir2, path)))
+
+    if ambiguous:
+        for path, same in PoolProcess(partial(same_content, algo=algo), ambiguous).map_return():
+            result['unchanged' if same else 'modified'].add(path)
+    return result
+
+
+def compare_trees(dir1, dir2, mode='path'):
+    """
+    Parse two directories and compare their files.
+
+    :param dir1: Original directory
+    :param dir2: New directory
+    :param mode: 'path' to return lists of files unique to each directory or 'content' to return a dictionary of
+    'added', 'removed', 'modified' and 'unchanged' sets of relative paths
+    """
+    if mode not in MODES:
+        raise ValueError("mode must be one of {0}, not '{1}'".format(MODES, mode))
+    if mode == 'content':
+        return compare_contents(dir1, dir2)
+
     paths1 = DirPaths(dir1).walk()
     paths2 = DirPaths(dir2).walk()
     return unique_venn(paths1, paths2)
@@ -0,0 +1,84 @@
+# Find duplicate files by content, hashing as few bytes as possible.
+import os
+from collections import defaultdict
+from functools import partial
+from multiprocessing import cpu_count
+
+from dirutility.hash import FAST_ALGORITHM, Hash, new_hasher, hexdigest
+from dirutility.multiprocess import PoolProcess
+from dirutility.walk import DirPaths
+
+# Number of bytes sampled from the start and end of each file for the partial hash
+SAMPLE_SIZE = 4096
+
+
+def partial_hash(file_path, sample_size=SAMPLE_SIZE, algo=FAST_ALGORITHM):
+    """Return a (file_path, hash) tuple, hashing only the first and last sample_size bytes of a file."""
+    hasher = new_hasher(algo)
+    with open(file_path, 'rb') as fp:
+        hasher.update(fp.read(sample_size))
+        if fp.seek(0, os.SEEK_END) > sample_size:
+            fp.seek(max(sample_size, fp.tell() - sample_size))
+            hasher.update(fp.read(sample_size))
+    return file_path, hexdigest(hasher)
+
+
+def full_hash(file_path, algo='sha256'):
+    """Return a (file_path, hash) tuple of a file's entire contents."""
+    return file_path, Hash.from_file(file_path, algo)
+
+
+def _collisions(groups):
+    """Return a list of paths within groups that have more than one member."""
+    return [path for paths in groups.values() if len(paths) > 1 for path in paths]
+
+
+def _regroup(groups, hashes):
+    """Split groups of paths by hash, keyed on (previous key, hash)."""
+    hashes = dict(hashes)
+    regrouped = defaultdict(list)
+    for key, paths in groups.items():
+        if len(paths) > 1:
+            for path in paths:
+                regrouped[(key, hashes[path])].append(path)
+    return regrouped
+
+
+def find_duplicates(directory, min_size=1, sample_size=SAMPLE_SIZE, algo='sha256', cpus=cpu_count(), paths=None):
+    """
+    Find groups of files with identical contents.
+
+    Files are grouped by size first, then by a cheap xxh64 (blake2b without xxhash) hash of their first & last
+    sample_size bytes and only files that still collide are hashed in full.  Hashing is pool processed.
+
+    :param directory: Root directory (or list of directories) to search
+    :param min_size: Minimum file size in bytes, empty files are skipped by default
+    :param sample_size: Number of bytes hashed from the start and end of each file for the partial hash
+    :param algo: Hashing algorithm used to confirm duplicates
+    :param cpus: Number of cpu cores used for hashing
+    :param paths: Optional list of file paths to use instead of walking directory
+    :return: List of duplicate groups, each a sorted list of file paths
+    """
+    if paths is None:
+        paths = DirPaths(directory, full_paths=True, engine='scandir').walk()
+
+    # Group by file size
+    groups = defaultdict(list)
+    for path in paths:
+        size = os.path.getsize(path)
+        if size >= min_size:
+            groups[size].append(path)
+
+    # Split size collisions by the hash of a sample of their contents
+    candidates = _collisions(groups)
+    if candidates:
+        func = partial(partial_hash, sample_size=sample_size)
+        groups = _regroup(groups, PoolProcess(func, candidates, cpus=cpus).map_return())
+
+    # Confirm the remaining collisions with a hash of their full contents
+    candidates = _collisions(groups)
+    if candidates:
+        func = partial(full_hash, algo=algo)
+        groups = _regroup(groups, PoolProcess(func, candidates, cpus=cpus).map_return())
+
+    return sorted(sorted(paths) for paths in groups.values() if len(paths) > 1)
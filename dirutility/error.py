@@ -8,3 +8,7 @@ class InvalidAbsoluteDirectoryError(Exception):
 
 class InvalidDirStructureError(Exception):
     pass
+
+
+class StaleIndexError(Exception):
+    pass
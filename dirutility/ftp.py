@@ -1,6 +1,18 @@
 # Connect to a server via FTP and execute commands
 import ftplib
 import os
+import posixpath
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from queue import LifoQueue, Empty
+from threading import BoundedSemaphore, Lock
+
+# Errors worth retrying a transfer on a new session: temporary (4xx) replies and broken connections.  Permanent (5xx)
+# replies and local file errors are raised immediately
+TRANSIENT_ERRORS = (ftplib.error_temp, ftplib.error_reply, ftplib.error_proto, ConnectionError, socket.timeout,
+                    EOFError)
 
 
 class FTP:
@@ -160,3 +172,165 @@ class FTP:
 
             # Upload file & return response
             return self.session.storbinary(dst_cmd, local_file)
+
+
+class FTPPool:
+
+    def __init__(self, host, username, password, port=21, size=4, retries=3, retry_delay=1.0):
+        """
+        Transfer files concurrently over a pool of logged in FTP sessions.
+
+        Sessions are opened as transfers need them, up to size, and reused afterwards.  Every command uses paths
+        relative to the login directory (or absolute paths) so sessions are never left in another working directory
+        and the local working directory is never changed.  A transfer failing with a transient error is retried on a
+        new session after retry_delay seconds, doubling the delay after each attempt.
+
+        :param host: FTP server host
+        :param username: Login user name
+        :param password: Login password
+        :param port: FTP server port
+        :param size: Maximum number of sessions and concurrent transfers
+        :param retries: Number of times a transfer is retried after a transient error
+        :param retry_delay: Seconds waited before the first retry
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1, not '{0}'".format(size))
+        self._connection = (host, username, password, port)
+        self.size = size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._idle = LifoQueue()
+        self._slots = BoundedSemaphore(size)
+        self._directories = set()
+        self._directories_lock = Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @contextmanager
+    def session(self):
+        """Borrow a logged in ftplib.FTP session from the pool, sessions raising anything but a 5xx reply are closed."""
+        self._slots.acquire()
+        try:
+            try:
+                ftp = self._idle.get_nowait()
+            except Empty:
+                ftp = FTP(*self._connection)
+            try:
+                yield ftp.session
+            except ftplib.error_perm:
+                # The server replied, so the session is still in step with it
+                self._idle.put(ftp)
+                raise
+            except BaseException:
+                # A transfer interrupted part way may leave an unread reply behind, don't reuse the session
+                ftp.close()
+                raise
+            else:
+                self._idle.put(ftp)
+        finally:
+            self._slots.release()
+
+    def _retry(self, func, *args):
+        """Call func with a session & args, retrying transient errors with exponential backoff."""
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            try:
+                with self.session() as session:
+                    return func(session, *args)
+            except TRANSIENT_ERRORS:
+                if attempt == self.retries:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
+    def _makedirs(self, session, directory):
+        """Create a remote directory and its parents, remembering directories already created."""
+        parents = []
+        while directory and directory not in self._directories and directory != posixpath.dirname(directory):
+            parents.append(directory)
+            directory = posixpath.dirname(directory)
+        for directory in reversed(parents):
+            try:
+                session.mkd(directory)
+            except ftplib.error_perm:
+                # Directory already exists
+                pass
+            with self._directories_lock:
+                self._directories.add(directory)
+
+    def _put(self, session, local_file, remote):
+        self._makedirs(session, posixpath.dirname(remote))
+        local_file.seek(0)
+        return session.storbinary('STOR ' + remote, local_file)
+
+    @staticmethod
+    def _get(session, remote, local_file):
+        local_file.seek(0)
+        local_file.truncate()
+        return session.retrbinary('RETR ' + remote, local_file.write)
+
+    def put(self, local, remote):
+        """Upload a local file to a remote file path, creating remote directories as needed."""
+        with open(local, 'rb') as local_file:
+            return self._retry(self._put, local_file, remote)
+
+    def get(self, remote, local):
+        """Download a remote file to a local file path, creating local directories as needed."""
+        if os.path.dirname(local):
+            os.makedirs(os.path.dirname(local), exist_ok=True)
+        try:
+            with open(local, 'wb') as local_file:
+                return self._retry(self._get, remote, local_file)
+        except BaseException:
+            # Don't leave a partial download behind
+            if os.path.exists(local):
+                os.remove(local)
+            raise
+
+    def _map(self, func, transfers):
+        with ThreadPoolExecutor(self.size) as executor:
+            return list(executor.map(lambda transfer: func(*transfer), transfers))
+
+    def put_many(self, transfers):
+        """
+        Upload (local, remote) file path pairs concurrently.
+
+        :param transfers: Iterable of (local, remote) pairs
+        :return: List of server responses in the order of transfers, the first failed transfer's error is raised
+        """
+        return self._map(self.put, transfers)
+
+    def get_many(self, transfers):
+        """
+        Download (remote, local) file path pairs concurrently.
+
+        :param transfers: Iterable of (remote, local) pairs
+        :return: List of server responses in the order of transfers, the first failed transfer's error is raised
+        """
+        return self._map(self.get, transfers)
+
+    def put_tree(self, source, remote):
+        """Upload every file within a local directory to a remote directory, keeping the directory structure."""
+        transfers = []
+        for root, dirs, files in os.walk(source):
+            directory = os.path.relpath(root, source)
+            for file_name in files:
+                path = file_name if directory == '.' else posixpath.join(*directory.split(os.sep), file_name)
+                transfers.append((os.path.join(root, file_name), posixpath.join(remote, path)))
+        return self.put_many(transfers)
+
+    def close(self):
+        """Send a QUIT command on every idle session and close it."""
+        while True:
+            try:
+                ftp = self._idle.get_nowait()
+            except Empty:
+                break
+            try:
+                ftp.disconnect()
+            except ftplib.all_errors:
+                ftp.close()
@@ -1,120 +1,212 @@
+from hashlib import md5, sha256, sha1, blake2b, blake2s, sha512, shake_128
+
 try:
-    from hashlib import md5, sha256, sha1, blake2b, blake2s, sha512, shake_128
     from xxhash import xxh32, xxh64
-
-    class _HashAlgos:
-
-        def __init__(self, string):
-            self.string = string
-
-            self._md5 = None
-            self._sha1 = None
-            self._sha256 = None
-            self._sha512 = None
-            self._blake2b = None
-            self._blake2s = None
-            self._shake_128 = None
-            self._xxh32 = None
-            self._xxh64 = None
-
-        def _get_md5(self):
-            """Hash a string using the md5 algo and return in hexdigested form."""
-            return md5(self.string).hexdigest()
-
-        def _get_sha1(self):
-            """Hash a string using the sha256 algo and return in hexdigested form."""
-            return sha1(self.string).hexdigest()
-
-        def _get_sha256(self):
-            """Hash a string using the sha256 algo and return in hexdigested form."""
-            return sha256(self.string).hexdigest()
-
-        def _get_sha512(self):
-            """Hash a string using the sha512algo and return in hexdigested form."""
-            return sha512(self.string).hexdigest()
-
-        def _get_blake2b(self):
-            """Hash a string using the blake2b algo and return in hexdigested form."""
-            return blake2b(self.string).hexdigest()
-
-        def _get_blake2s(self):
-            """Hash a string using the blake2b algo and return in hexdigested form."""
-            return blake2s(self.string).hexdigest()
-
-        def _get_shake_128(self):
-            """Hash a string using the shake_128 algo and return in hexdigested form."""
-            return shake_128(self.string).hexdigest(128)
-
-        def _get_xxh32(self):
-            """Hash a string using the xxh32 algo and return in hexdigested form."""
-            return xxh32(self.string).hexdigest()
-
-        def _get_xxh64(self):
-            """Hash a string using the xxh64 algo and return in hexdigested form."""
-            return xxh64(self.string).hexdigest()
-
-    class Hash(_HashAlgos):
-
-        def __init__(self, string):
-            super(Hash, self).__init__(string)
-
-        def md5(self):
-            """Return a hexdigested md5 hash."""
-            if not self._md5:
-                self._md5 = self._get_md5()
-            return self._md5
-
-        def sha1(self):
-            """Return a hexdigested sha256 hash."""
-            if not self._sha1:
-                self._sha1 = self._get_sha1()
-            return self._sha1
-
-        def sha256(self):
-            """Return a hexdigested sha256 hash."""
-            if not self._sha256:
-                self._sha256 = self._get_sha256()
-            return self._sha256
-
-        def sha512(self):
-            """Return a hexdigested sha256 hash."""
-            if not self._sha512:
-                self._sha512 = self._get_sha512()
-            return self._sha512
-
-        def blake2b(self):
-            """Return a hexdigested blake2b hash."""
-            if not self._blake2b:
-                self._blake2b = self._get_blake2b()
-            return self._blake2b
-
-        def blake2s(self):
-            """Return a hexdigested blake2s hash."""
-            if not self._blake2s:
-                self._blake2s = self._get_blake2s()
-            return self._blake2s
-
-        def shake_128(self):
-            """Return a hexdigested shake_128 hash."""
-            if not self._shake_128:
-                self._shake_128 = self._get_shake_128()
-            return self._shake_128
-
-        def xxh32(self):
-            """Return a hexdigested xxh32 hash."""
-            if not self._xxh32:
-                self._xxh32 = self._get_xxh32()
-            return self._xxh32
-
-        def xxh64(self):
-            """Return a hexdigested xxh64 hash."""
-            if not self._xxh64:
-                self._xxh64 = self._get_xxh64()
-            return self._xxh64
-
 except ImportError:
-
-    class Hash:
-
-        def __init__(self, *args, **kwargs):
-            pass
+    xxh32, xxh64 = None, None
+
+# Default number of bytes read from a file per chunk when hashing file contents
+CHUNK_SIZE = 1024 * 1024
+
+# Fastest non-cryptographic algorithm available, xxhash is an optional dependency
+FAST_ALGORITHM = 'xxh64' if xxh64 else 'blake2b'
+
+ALGORITHMS = {
+    'md5': md5,
+    'sha1': sha1,
+    'sha256': sha256,
+    'sha512': sha512,
+    'blake2b': blake2b,
+    'blake2s': blake2s,
+    'shake_128': shake_128,
+    'xxh32': xxh32,
+    'xxh64': xxh64,
+}
+
+
+def new_hasher(algo):
+    """Return a new hash object for an algorithm name."""
+    if algo not in ALGORITHMS:
+        raise ValueError("algo must be one of {0}, not '{1}'".format(tuple(ALGORITHMS), algo))
+    if ALGORITHMS[algo] is None:
+        raise ImportError('xxhash must be installed to use the {0} algorithm'.format(algo))
+    return ALGORITHMS[algo]()
+
+
+def hexdigest(hasher):
+    """Return the hexdigested value of a hash object."""
+    return hasher.hexdigest(128) if hasher.name == 'shake_128' else hasher.hexdigest()
+
+
+def read_chunks(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Generate the contents of a file in fixed size chunks.
+
+    Chunks are read into a single reused buffer and yielded as memoryview slices, so a chunk is only valid until the
+    next one is requested.
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(file_path, 'rb', buffering=0) as fp:
+        while True:
+            size = fp.readinto(buffer)
+            if not size:
+                break
+            yield view[:size]
+
+
+class _HashAlgos:
+
+    def __init__(self, string):
+        self.string = string
+
+        self._md5 = None
+        self._sha1 = None
+        self._sha256 = None
+        self._sha512 = None
+        self._blake2b = None
+        self._blake2s = None
+        self._shake_128 = None
+        self._xxh32 = None
+        self._xxh64 = None
+
+    def _get_md5(self):
+        """Hash a string using the md5 algo and return in hexdigested form."""
+        return md5(self.string).hexdigest()
+
+    def _get_sha1(self):
+        """Hash a string using the sha256 algo and return in hexdigested form."""
+        return sha1(self.string).hexdigest()
+
+    def _get_sha256(self):
+        """Hash a string using the sha256 algo and return in hexdigested form."""
+        return sha256(self.string).hexdigest()
+
+    def _get_sha512(self):
+        """Hash a string using the sha512algo and return in hexdigested form."""
+        return sha512(self.string).hexdigest()
+
+    def _get_blake2b(self):
+        """Hash a string using the blake2b algo and return in hexdigested form."""
+        return blake2b(self.string).hexdigest()
+
+    def _get_blake2s(self):
+        """Hash a string using the blake2b algo and return in hexdigested form."""
+        return blake2s(self.string).hexdigest()
+
+    def _get_shake_128(self):
+        """Hash a string using the shake_128 algo and return in hexdigested form."""
+        return shake_128(self.string).hexdigest(128)
+
+    def _get_xxh32(self):
+        """Hash a string using the xxh32 algo and return in hexdigested form."""
+        hasher = new_hasher('xxh32')
+        hasher.update(self.string)
+        return hasher.hexdigest()
+
+    def _get_xxh64(self):
+        """Hash a string using the xxh64 algo and return in hexdigested form."""
+        hasher = new_hasher('xxh64')
+        hasher.update(self.string)
+        return hasher.hexdigest()
+
+
+class Hash(_HashAlgos):
+
+    def __init__(self, string):
+        super(Hash, self).__init__(string)
+
+    @staticmethod
+    def from_file(file_path, algo='md5', chunk_size=CHUNK_SIZE):
+        """
+        Hash the contents of a file without loading the whole file into memory.
+
+        :param file_path: Path of the file to hash
+        :param algo: Hashing algorithm name, any of md5, sha1, sha256, sha512, blake2b, blake2s, shake_128, xxh32, xxh64
+        :param chunk_size: Number of bytes read from the file at a time
+        :return: Hexdigested hash
+        """
+        hasher = new_hasher(algo)
+        for chunk in read_chunks(file_path, chunk_size):
+            hasher.update(chunk)
+        return hexdigest(hasher)
+
+    @staticmethod
+    def multi(source, algos=('md5', 'sha256'), chunk_size=CHUNK_SIZE):
+        """
+        Compute several hashes in a single pass over a file or buffer.
+
+        Each chunk is read once and fed to every requested hasher, so N digests cost one read instead of N.
+
+        :param source: Bytes-like buffer, file path or binary file object
+        :param algos: Iterable of hashing algorithm names
+        :param chunk_size: Number of bytes read from a file at a time
+        :return: Dictionary of algorithm name, hexdigested hash pairs
+        """
+        hashers = {algo: new_hasher(algo) for algo in algos}
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            chunks = [source]
+        elif hasattr(source, 'read'):
+            chunks = iter(lambda: source.read(chunk_size), b'')
+        else:
+            chunks = read_chunks(source, chunk_size)
+
+        updates = [hasher.update for hasher in hashers.values()]
+        for chunk in chunks:
+            for update in updates:
+                update(chunk)
+        return {algo: hexdigest(hasher) for algo, hasher in hashers.items()}
+
+    def md5(self):
+        """Return a hexdigested md5 hash."""
+        if not self._md5:
+            self._md5 = self._get_md5()
+        return self._md5
+
+    def sha1(self):
+        """Return a hexdigested sha256 hash."""
+        if not self._sha1:
+            self._sha1 = self._get_sha1()
+        return self._sha1
+
+    def sha256(self):
+        """Return a hexdigested sha256 hash."""
+        if not self._sha256:
+            self._sha256 = self._get_sha256()
+        return self._sha256
+
+    def sha512(self):
+        """Return a hexdigested sha256 hash."""
+        if not self._sha512:
+            self._sha512 = self._get_sha512()
+        return self._sha512
+
+    def blake2b(self):
+        """Return a hexdigested blake2b hash."""
+        if not self._blake2b:
+            self._blake2b = self._get_blake2b()
+        return self._blake2b
+
+    def blake2s(self):
+        """Return a hexdigested blake2s hash."""
+        if not self._blake2s:
+            self._blake2s = self._get_blake2s()
+        return self._blake2s
+
+    def shake_128(self):
+        """Return a hexdigested shake_128 hash."""
+        if not self._shake_128:
+            self._shake_128 = self._get_shake_128()
+        return self._shake_128
+
+    def xxh32(self):
+        """Return a hexdigested xxh32 hash."""
+        if not self._xxh32:
+            self._xxh32 = self._get_xxh32()
+        return self._xxh32
+
+    def xxh64(self):
+        """Return a hexdigested xxh64 hash."""
+        if not self._xxh64:
+            self._xxh64 = self._get_xxh64()
+        return self._xxh64
@@ -1,3 +1,4 @@
-__all__ = ['tempdir']
+__all__ = ['tempdir', 'ArchiveIndex']
 
 from dirutility.open.open import tempdir
+from dirutility.open.index import ArchiveIndex
@@ -1,12 +1,29 @@
 from __future__ import annotations
 
 import abc
+import io
 import os
 import tarfile
-from typing import Union, Dict, TextIO, List
-from zipfile import PyZipFile
+import time
+import zipfile
+import zlib
+from operator import attrgetter
+from typing import Union, Dict, TextIO, List, Optional, Iterator, Tuple
 
 from dirutility.error import InvalidFileNameError, InvalidDirStructureError
+from dirutility.open.compress import ParallelCompressor
+from dirutility.open.index import IndexedTarFile, write_index, tar_members, zip_members, index_path
+from dirutility.open.zipwrite import append_compressed
+
+# Files larger than this are streamed into zip archives, smaller files are read in a single call and written in batches
+ZIP_BUFFER_SIZE = 1024 * 1024
+
+
+def directory_zipinfo(name: str, date_time: Optional[tuple] = None) -> zipfile.ZipInfo:
+    """Return the ZipInfo of a directory entry."""
+    zinfo = zipfile.ZipInfo(name.rstrip('/') + '/', date_time or time.localtime()[:6])
+    zinfo.external_attr = 0o40755 << 16 | 0x10
+    return zinfo
 
 
 class DirStructure:
@@ -46,7 +63,7 @@ class DirStructure:
             if _c is None:
                 fd = open(path, 'w')
                 fd.close()
-            if isinstance(_c, str):
+            elif isinstance(_c, str):
                 with open(path, 'w') as fd:
                     fd.write(_c)
             elif isinstance(_c, dict):
@@ -59,6 +76,62 @@ class DirStructure:
                     for _l in _c:
                         fd.write(_l)
 
+    @staticmethod
+    def _read(content) -> bytes:
+        if content is None:
+            return b''
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, str):
+            return content.encode()
+        data = content.read() if hasattr(content, 'read') else ''.join(content)
+        return data.encode() if isinstance(data, str) else data
+
+    def members(self, prefix: str = '') -> Iterator[Tuple[str, Optional[bytes]]]:
+        """
+        Generate (archive name, data) tuples for every file and directory without writing to disk.
+
+        Data is None for directories, names are sorted within each directory.
+
+        :param prefix: prefix of the archive names, ending with a slash
+        """
+        for filename in self.dirsname:
+            self.validate_filename(filename)
+            _c = self._content[filename]
+            path = prefix + filename
+            if isinstance(_c, DirStructure):
+                yield path, None
+                yield from _c.members(path + '/')
+            else:
+                yield path, self._read(_c)
+
+    def write_tar(self, tar: tarfile.TarFile, prefix: str = ''):
+        """Add the structure to an open tarfile from in memory buffers."""
+        mtime = time.time()
+        for name, data in self.members(prefix):
+            info = tarfile.TarInfo(name)
+            info.mtime = mtime
+            if data is None:
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+                tar.addfile(info)
+            else:
+                info.size = len(data)
+                info.mode = 0o644
+                tar.addfile(info, io.BytesIO(data))
+
+    def write_zip(self, zip_file: zipfile.ZipFile, prefix: str = ''):
+        """Add the structure to an open zipfile from in memory buffers."""
+        date_time = time.localtime()[:6]
+        for name, data in self.members(prefix):
+            if data is None:
+                info, data = directory_zipinfo(name, date_time), b''
+            else:
+                info = zipfile.ZipInfo(name, date_time)
+                info.external_attr = 0o644 << 16
+                info.compress_type = zip_file.compression
+            zip_file.writestr(info, data, compresslevel=zip_file.compresslevel)
+
 
 class DirBase(metaclass=abc.ABCMeta):
 
@@ -93,9 +166,44 @@ class TempDir(DirBase):
     pass
 
 
+class MemoryDir(DirBase):
+
+    def __init__(self, structure: Union[DirStructure, None] = None):
+        """Directory structure kept in memory, archives are built from it without writing files to disk."""
+        super(MemoryDir, self).__init__(None, structure)
+
+    def create_structure(self, **paths: Dict[str, Union[dict, str, TextIO, None]]):
+        self._structure = DirStructure(**paths)
+
+    @property
+    def structure(self) -> DirStructure:
+        return self._structure
+
+
 class TarFile(object):
 
-    def __init__(self, filepath: str, tempdir: TempDir, mode: str = 'w:gz'):
+    def __init__(self,
+                 filepath: str,
+                 tempdir: Union[TempDir, MemoryDir],
+                 mode: str = 'w:gz',
+                 parallel: bool = False,
+                 workers: Optional[int] = None,
+                 index: bool = False):
+        """
+        Tar archive of a temporary directory.
+
+        :param filepath: archive file path
+        :param tempdir: temporary directory object, archives of a MemoryDir are built without touching disk
+        :param mode: tarfile mode, the compression suffix (gz, bz2, xz or zst) must match the file name.  zst archives
+        are always written through a ParallelCompressor, with a single worker unless parallel
+        :param parallel: compress blocks of the tar stream concurrently with a ParallelCompressor
+        :param workers: number of compression threads when parallel, default is number of processors
+        :param index: write an index sidecar of member offsets, read by dirutility.open.ArchiveIndex.  Compressed
+        archives are written in independently compressed blocks, with a single worker unless parallel
+        """
+        self._parallel = parallel
+        self._workers = workers
+        self._index = index
 
         self._mode = mode.strip()
         _ar = self._mode.split(':')
@@ -111,7 +219,7 @@ class TarFile(object):
         self._tempdir = tempdir
 
     def _is_filename_valid(self, filename):
-        if filename.endswith(self._compress_type):
+        if filename.endswith(self._compress_type or '.tar'):
             return True
         else:
             return False
@@ -131,37 +239,143 @@ class TarFile(object):
             return self._filename_without_suffix
 
     @property
-    def tempdir(self) -> TempDir:
+    def tempdir(self) -> Union[TempDir, MemoryDir]:
         return self._tempdir
 
+    def _add(self, tar: tarfile.TarFile):
+        if isinstance(self._tempdir, MemoryDir):
+            self._tempdir.structure.write_tar(tar)
+            return
+        for dirpath, dirname in zip(self._tempdir.dirs(relative=False), self._tempdir.dirs()):
+            tar.add(dirpath, arcname=dirname, recursive=True)
+
+    @property
+    def index_path(self) -> Optional[str]:
+        return index_path(self._filepath) if self._index else None
+
     def create_archive(self, withdir: bool = False):
-        with tarfile.open(self._filepath, mode=self._mode) as tar:
-            for dirpath, dirname in zip(self._tempdir.dirs(relative=False), self._tempdir.dirs()):
-                tar.add(dirpath, arcname=dirname, recursive=True)
+        blocks = None
+        if self._compress_type == 'zst' or (self._parallel or self._index) and self._compress_type:
+            # Write an uncompressed tar stream through the compressor, indexed archives are compressed in blocks so
+            # members can be read without decompressing the archive from the start.  tarfile can't write zstandard
+            # itself so zst archives always go through the compressor
+            workers = self._workers if self._parallel else 1
+            with open(self._filepath, 'wb') as fp, ParallelCompressor(fp, self._compress_type,
+                                                                      workers=workers) as compressor:
+                with IndexedTarFile.open(fileobj=compressor, mode=self._open_mode + '|') as tar:
+                    self._add(tar)
+            blocks = compressor.blocks
+        else:
+            with IndexedTarFile.open(self._filepath, mode=self._mode) as tar:
+                self._add(tar)
+        if self._index:
+            write_index(self._filepath, 'tar', tar_members(tar.members), self._compress_type, blocks)
 
 
 class ZipFile(TarFile):
 
-    def __init__(self, filepath: str, tempdir: TempDir, mode: str = 'w:zip'):
-        super(ZipFile, self).__init__(filepath, tempdir, mode)
+    def __init__(self,
+                 filepath: str,
+                 tempdir: Union[TempDir, MemoryDir],
+                 mode: str = 'w:zip',
+                 compress_level: Optional[int] = None,
+                 index: bool = False):
+        """
+        Zip archive of a temporary directory.
+
+        :param filepath: archive file path
+        :param tempdir: temporary directory object, archives of a MemoryDir are built without touching disk
+        :param mode: zipfile mode followed by ':zip'
+        :param compress_level: deflate compression level, members are stored uncompressed when None
+        :param index: write an index sidecar of member offsets, read by dirutility.open.ArchiveIndex
+        """
+        super(ZipFile, self).__init__(filepath, tempdir, mode, index=index)
+        self._compression = zipfile.ZIP_STORED if compress_level is None else zipfile.ZIP_DEFLATED
+        self._compress_level = compress_level
+
+    def _zipinfo(self, arcname: str, stat: os.stat_result) -> zipfile.ZipInfo:
+        """Create a ZipInfo from a DirEntry stat instead of stat'ing the file again as ZipInfo.from_file does."""
+        date_time = max(time.localtime(stat.st_mtime)[:6], (1980, 1, 1, 0, 0, 0))
+        zinfo = zipfile.ZipInfo(arcname, date_time)
+        zinfo.external_attr = (stat.st_mode & 0xFFFF) << 16
+        zinfo.file_size = stat.st_size
+        zinfo.compress_type = self._compression
+        return zinfo
+
+    def _compress(self, zinfo: zipfile.ZipInfo, data: bytes) -> Tuple[zipfile.ZipInfo, bytes]:
+        """
+        Compress a member for append_compressed.
+
+        The CRC and sizes are known up front, so unlike ZipFile.writestr no seeking back to rewrite the local header
+        is needed.
+        """
+        zinfo.file_size = len(data)
+        zinfo.CRC = zlib.crc32(data)
+        if zinfo.compress_type == zipfile.ZIP_DEFLATED:
+            compressor = zlib.compressobj(-1 if self._compress_level is None else self._compress_level, zlib.DEFLATED,
+                                          -15)
+            data = compressor.compress(data) + compressor.flush()
+        zinfo.compress_size = len(data)
+        return zinfo, data
+
+    def _write_tree(self, zip_file: zipfile.ZipFile, prefix: str):
+        """
+        Write every file within the temporary directory to an open zip file in a single scandir pass.
+
+        Archive names are sliced from each path using the length of the temporary directory path.  Files no larger
+        than ZIP_BUFFER_SIZE are read in one call and batched, each batch is written once it fills the buffer.  Larger
+        files are streamed by ZipFile.write (ZIP64 extensions are used when required).  Empty directories are added
+        as directory entries.
+
+        Like os.walk, symlinked directories are not descended while symlinked files are archived by content.  Dangling
+        symlinks and special files (fifos, sockets & devices) are skipped.
+        """
+        batch = []
+        batch_size = 0
+        start = len(self._tempdir.dirpath) + 1
+        stack = [self._tempdir.dirpath]
+        while stack:
+            dirpath = stack.pop()
+            with os.scandir(dirpath) as entries:
+                entries = sorted(entries, key=attrgetter('name'))
+            if not entries and dirpath != self._tempdir.dirpath:
+                zinfo = directory_zipinfo(prefix + dirpath[start:].replace(os.sep, '/'))
+                batch.append(self._compress(zinfo, b''))
+
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # Removed since the directory was scanned
+                    continue
+                arcname = prefix + entry.path[start:].replace(os.sep, '/')
+                if stat.st_size > ZIP_BUFFER_SIZE:
+                    append_compressed(zip_file, batch)
+                    batch, batch_size = [], 0
+                    zip_file.write(entry.path, arcname)
+                    continue
+                with open(entry.path, 'rb', buffering=0) as src:
+                    batch.append(self._compress(self._zipinfo(arcname, stat), src.readall()))
+                batch_size += len(batch[-1][1])
+                if batch_size >= ZIP_BUFFER_SIZE:
+                    append_compressed(zip_file, batch)
+                    batch, batch_size = [], 0
+            stack.extend(reversed(subdirs))
+        append_compressed(zip_file, batch)
 
     def create_archive(self, withdir: bool = False):
-        zip_file = PyZipFile(self._filepath, mode=self._open_mode)
-        for root, dirs, files in os.walk(self._tempdir.dirpath):
-            if files:
-                for file in files:
-                    _fp = os.path.join(root, file)
-                    if withdir:
-                        zip_file.write(_fp,
-                                       arcname='{}/{}'.format(self.filename(with_suffix=False),
-                                                              _fp.replace(self._tempdir.dirpath, '')))
-                    else:
-                        zip_file.write(_fp, arcname=_fp.replace(self._tempdir.dirpath, ''))
-
+        prefix = self.filename(with_suffix=False) + '/' if withdir else ''
+        with zipfile.ZipFile(self._filepath, mode=self._open_mode, compression=self._compression,
+                             compresslevel=self._compress_level) as zip_file:
+            if isinstance(self._tempdir, MemoryDir):
+                self._tempdir.structure.write_zip(zip_file, prefix)
             else:
-                if withdir:
-                    zip_file.write(root,
-                                   arcname='{}/{}'.format(self.filename(with_suffix=False),
-                                                          root.replace(self._tempdir.dirpath, '')))
-                else:
-                    zip_file.write(root, arcname=root.replace(self._tempdir.dirpath, ''))
+                self._write_tree(zip_file, prefix)
+        if self._index:
+            write_index(self._filepath, 'zip', zip_members(zip_file.filelist))
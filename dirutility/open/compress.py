@@ -0,0 +1,148 @@
+import bz2
+import lzma
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import cpu_count
+from typing import BinaryIO, Callable, List, Optional, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Number of uncompressed bytes compressed independently by each worker
+BLOCK_SIZE = 1024 * 1024
+
+
+def compress_gz(block: bytes, level: Optional[int] = None) -> bytes:
+    """Compress a block into a complete gzip member."""
+    compressor = zlib.compressobj(9 if level is None else level, zlib.DEFLATED, 31)
+    return compressor.compress(block) + compressor.flush()
+
+
+def compress_bz2(block: bytes, level: Optional[int] = None) -> bytes:
+    """Compress a block into a complete bzip2 stream."""
+    return bz2.compress(block, 9 if level is None else level)
+
+
+def compress_xz(block: bytes, level: Optional[int] = None) -> bytes:
+    """Compress a block into a complete xz stream."""
+    return lzma.compress(block, preset=6 if level is None else level)
+
+
+def compress_zst(block: bytes, level: Optional[int] = None) -> bytes:
+    """Compress a block into a complete zstandard frame."""
+    if zstandard is None:
+        raise ImportError('zstandard must be installed to use the zst codec')
+    return zstandard.ZstdCompressor(level=3 if level is None else level).compress(block)
+
+
+# Codecs whose independently compressed blocks concatenate into a stream standard tools decompress in one pass,
+# add entries to support other formats
+CODECS = {
+    'gz': compress_gz,
+    'bz2': compress_bz2,
+    'xz': compress_xz,
+    'zst': compress_zst,
+}
+
+
+class ParallelCompressor:
+
+    def __init__(self,
+                 fileobj: BinaryIO,
+                 codec: Union[str, Callable[[bytes, Optional[int]], bytes]] = 'gz',
+                 level: Optional[int] = None,
+                 block_size: int = BLOCK_SIZE,
+                 workers: Optional[int] = None):
+        """
+        Writable file object compressing data in blocks concurrently, similar to pigz.
+
+        Written data is split into fixed size blocks that are compressed independently within a pool of threads and
+        written to fileobj in order.  Each block becomes a complete gzip member (or bzip2/xz stream, zstandard
+        frame), so the output is a regular multi-member file readable by gzip, tarfile and other standard tools.
+        zlib, bz2 and lzma release the GIL while compressing so threads scale with cores.
+
+        The uncompressed and compressed offset of each block are recorded in blocks.
+
+        :param fileobj: Binary file object the compressed stream is written to
+        :param codec: Name of a codec within CODECS or a function compressing a (block, level) pair
+        :param level: Compression level, defaults to the codec's default level
+        :param block_size: Number of uncompressed bytes per block
+        :param workers: Number of compression threads, default is number of processors
+        """
+        if isinstance(codec, str):
+            if codec not in CODECS:
+                raise ValueError("codec must be one of {0}, not '{1}'".format(tuple(CODECS), codec))
+            codec = CODECS[codec]
+        self._compress = codec
+        self._fileobj = fileobj
+        self._level = level
+        self._block_size = block_size
+        self._workers = workers or cpu_count()
+        self._executor = ThreadPoolExecutor(self._workers)
+        self._pending = deque()
+        self._buffer = bytearray()
+        self._offset = 0
+        self._compressed_offset = 0
+        self.blocks: List[Tuple[int, int]] = []
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        """Return the number of uncompressed bytes written."""
+        return self._offset + len(self._buffer)
+
+    def write(self, data: bytes) -> int:
+        if self.closed:
+            raise ValueError('write to closed file')
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            self._submit(bytes(self._buffer[:self._block_size]))
+            del self._buffer[:self._block_size]
+        return len(data)
+
+    def _submit(self, block: bytes):
+        # Keep a bounded number of blocks in memory, writing the oldest once every worker is busy
+        while len(self._pending) >= self._workers * 2:
+            self._write_next()
+        self._pending.append((len(block), self._executor.submit(self._compress, block, self._level)))
+
+    def _write_next(self):
+        size, future = self._pending.popleft()
+        data = future.result()
+        self.blocks.append((self._offset, self._compressed_offset))
+        self._fileobj.write(data)
+        self._offset += size
+        self._compressed_offset += len(data)
+
+    def flush(self):
+        """Compress and write any buffered data, ending the current block early."""
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self._write_next()
+        self._fileobj.flush()
+
+    def close(self):
+        """Write the remaining blocks, the underlying file object is left open."""
+        if self.closed:
+            return
+        try:
+            # An empty stream still needs one (empty) block to be a valid compressed file
+            if not self.blocks and not self._pending and not self._buffer:
+                self._submit(b'')
+            self.flush()
+        finally:
+            self._executor.shutdown()
+            self.closed = True
@@ -0,0 +1,186 @@
+import bisect
+import bz2
+import gzip
+import json
+import lzma
+import os
+import struct
+import tarfile
+import zipfile
+import zlib
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from dirutility.error import StaleIndexError
+from dirutility.open import compress
+
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 2
+
+# Size of a zip local file header before the variable length file name & extra fields
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+
+
+def _open_zst(fileobj: BinaryIO) -> BinaryIO:
+    if compress.zstandard is None:
+        raise ImportError('zstandard must be installed to read zst archives')
+    return compress.zstandard.ZstdDecompressor().stream_reader(fileobj, read_across_frames=True)
+
+
+# Functions wrapping a file object positioned at the start of a block in a decompressing reader, the readers continue
+# across the concatenated blocks written by a ParallelCompressor (or a single stream)
+DECOMPRESSORS = {
+    'gz': lambda fileobj: gzip.GzipFile(fileobj=fileobj, mode='rb'),
+    'bz2': bz2.BZ2File,
+    'xz': lzma.LZMAFile,
+    'zst': _open_zst,
+}
+
+
+def index_path(archive: str) -> str:
+    """Return the file path of an archive's index sidecar."""
+    return archive + INDEX_SUFFIX
+
+
+def write_index(archive: str,
+                archive_format: str,
+                members: Dict[str, list],
+                codec: Optional[str] = None,
+                blocks: Optional[List[Tuple[int, int]]] = None) -> str:
+    """
+    Write the index sidecar of an archive.
+
+    :param archive: archive file path
+    :param archive_format: 'zip' or 'tar'
+    :param members: dictionary of member name, location pairs, see zip_members and tar_members
+    :param codec: compression codec of a tar archive
+    :param blocks: (uncompressed offset, compressed offset) tuples of independently compressed blocks
+    :return: index file path
+    """
+    stat = os.stat(archive)
+    data = {
+        'version': INDEX_VERSION,
+        'format': archive_format,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'codec': codec,
+        'blocks': blocks if blocks else [(0, 0)],
+        'members': members
+    }
+    with open(index_path(archive), 'w') as fp:
+        json.dump(data, fp, separators=(',', ':'))
+    return index_path(archive)
+
+
+def zip_members(infolist: List[zipfile.ZipInfo]) -> Dict[str, list]:
+    """Return [header offset, compressed size, size, compress type, CRC] locations of zip file members."""
+    return {i.filename: [i.header_offset, i.compress_size, i.file_size, i.compress_type, i.CRC]
+            for i in infolist if not i.is_dir()}
+
+
+def tar_members(members: List[tarfile.TarInfo]) -> Dict[str, list]:
+    """Return [data offset, size] locations, within the uncompressed tar stream, of regular tar file members."""
+    return {m.name: [m.offset_data, m.size] for m in members if m.isreg()}
+
+
+def index_zip(archive: str) -> str:
+    """Write the index sidecar of an existing zip archive."""
+    with zipfile.ZipFile(archive) as zip_file:
+        return write_index(archive, 'zip', zip_members(zip_file.infolist()))
+
+
+class IndexedTarFile(tarfile.TarFile):
+    """TarFile that records the offset of every member it writes, which are needed to index archives."""
+
+    def addfile(self, tarinfo, fileobj=None):
+        start = self.offset
+        super().addfile(tarinfo, fileobj)
+        member = self.members[-1]
+        data_blocks = -(-tarinfo.size // tarfile.BLOCKSIZE) if fileobj is not None else 0
+        member.offset = start
+        member.offset_data = self.offset - data_blocks * tarfile.BLOCKSIZE
+
+
+class ArchiveIndex:
+
+    def __init__(self, archive: str):
+        """
+        Random access reader of a zip or tar archive using the index sidecar written when it was created.
+
+        Zip members are read by seeking directly to their local header.  Tar members are read by seeking to the
+        compressed block containing the start of the member and decompressing from there as a stream, so reading a
+        member costs O(block size + member) time and O(member) memory rather than O(archive).  TarFile writes
+        compressed archives in blocks whenever index is true.  Uncompressed tar members are read directly.
+
+        :param archive: archive file path
+        :raises StaleIndexError: when the archive size or modification time no longer match the index
+        """
+        self.archive = archive
+        with open(index_path(archive)) as fp:
+            data = json.load(fp)
+        stat = os.stat(archive)
+        if data.get('version') != INDEX_VERSION or data['size'] != stat.st_size or data['mtime_ns'] != stat.st_mtime_ns:
+            raise StaleIndexError('{0} does not match {1}'.format(index_path(archive), archive))
+        self.format = data['format']
+        self.codec = data['codec']
+        self.blocks = [tuple(b) for b in data['blocks']]
+        self.members = data['members']
+        self._offsets = [b[0] for b in self.blocks]
+
+    def __len__(self):
+        return len(self.members)
+
+    def __contains__(self, name):
+        return name in self.members
+
+    def names(self) -> List[str]:
+        return list(self.members)
+
+    def _read_zip(self, name: str) -> bytes:
+        header_offset, compress_size, file_size, compress_type, crc = self.members[name]
+        if compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            with zipfile.ZipFile(self.archive) as zip_file:
+                return zip_file.read(name)
+
+        with open(self.archive, 'rb') as fp:
+            fp.seek(header_offset)
+            header = _LOCAL_HEADER.unpack(fp.read(_LOCAL_HEADER.size))
+            if header[0] != b'PK\x03\x04':
+                raise zipfile.BadZipFile('Bad magic number for file header of {0}'.format(name))
+            fp.seek(header[-2] + header[-1], os.SEEK_CUR)
+            data = fp.read(compress_size)
+        if compress_type == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -15)
+        if len(data) != file_size or zlib.crc32(data) != crc:
+            raise zipfile.BadZipFile('Bad CRC-32 for file {0}'.format(name))
+        return data
+
+    def _read_tar(self, name: str) -> bytes:
+        offset, size = self.members[name]
+        if self.codec is None:
+            with open(self.archive, 'rb') as fp:
+                fp.seek(offset)
+                return fp.read(size)
+
+        block = self.blocks[bisect.bisect_right(self._offsets, offset) - 1]
+        with open(self.archive, 'rb') as fp:
+            fp.seek(block[1])
+            with DECOMPRESSORS[self.codec](fp) as reader:
+                reader.seek(offset - block[0])
+                return reader.read(size)
+
+    def read(self, name: str) -> bytes:
+        """Return the contents of a member."""
+        if name not in self.members:
+            raise KeyError('There is no item named {0!r} in the archive'.format(name))
+        return self._read_zip(name) if self.format == 'zip' else self._read_tar(name)
+
+    def extract(self, name: str, destination: str) -> str:
+        """Extract a member to a destination directory and return the extracted file path."""
+        parts = name.split('/')
+        if name.startswith('/') or '..' in parts:
+            raise ValueError("member name must be relative, not '{0}'".format(name))
+        path = os.path.join(destination, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fp:
+            fp.write(self.read(name))
+        return path
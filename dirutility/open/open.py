@@ -1,10 +1,11 @@
 import os
 import tempfile
-from contextlib import contextmanager
-from typing import Dict, Union, TextIO
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Union, TextIO, Optional
 
 from dirutility.error import InvalidAbsoluteDirectoryError
-from dirutility.open.clazz import TempDir, TarFile, ZipFile
+from dirutility.open.clazz import TempDir, MemoryDir, TarFile, ZipFile
+from dirutility.open.index import index_path
 
 
 @contextmanager
@@ -36,10 +37,14 @@ def tempdir(absdirpath: str, prefix='', suffix='') -> TempDir:
 
 @contextmanager
 def tartempdir(absfilepath: str,
-               tempdir: TempDir,
+               tempdir: Union[TempDir, MemoryDir],
                mode: str = 'w:gz',
                temp: bool = True,
-               force: bool = True) -> TarFile:
+               force: bool = True,
+               parallel: bool = False,
+               workers: Optional[int] = None,
+               compress_level: Optional[int] = None,
+               index: bool = False) -> TarFile:
     """
     Create and return a tarfile directory.  This has the same
     behavior as mkdtemp then create tarfile from temp dir but can be used as a context manager.  For
@@ -56,37 +61,53 @@ def tartempdir(absfilepath: str,
     :param mode: tarfile mode
     :param temp: temporary file
     :param force: force create file
+    :param parallel: compress the archive in blocks concurrently (multi-member gzip, bz2 or xz streams, zstd frames)
+    :param workers: number of compression threads when parallel
+    :param compress_level: zip archive deflate level, members are stored uncompressed when None
+    :param index: write an index sidecar of member offsets next to the archive, read by ArchiveIndex
     :return:
     :rtype: TarFile
     """
     file_create_by_me = False
     try:
         if force:
-            yield _create_archive(absfilepath, tempdir, mode)
+            yield _create_archive(absfilepath, tempdir, mode, parallel, workers, compress_level, index)
             file_create_by_me = True
         elif not os.path.exists(absfilepath):
-            yield _create_archive(absfilepath, tempdir, mode)
+            yield _create_archive(absfilepath, tempdir, mode, parallel, workers, compress_level, index)
         else:
             raise FileExistsError(absfilepath)
     finally:
         if temp and file_create_by_me:
             os.remove(absfilepath)
+            if index and os.path.exists(index_path(absfilepath)):
+                os.remove(index_path(absfilepath))
         else:
             pass
 
 
-def _create_archive(absfilepath, tempdir, mode) -> TarFile:
+def _create_archive(absfilepath,
+                    tempdir,
+                    mode,
+                    parallel=False,
+                    workers=None,
+                    compress_level=None,
+                    index=False) -> TarFile:
     """
 
     :param absfilepath:
     :param tempdir:
     :param mode:
+    :param parallel:
+    :param workers:
+    :param compress_level:
+    :param index:
     :return:
     """
     if mode.endswith('zip'):
-        return ZipFile(absfilepath, tempdir, mode)
+        return ZipFile(absfilepath, tempdir, mode, compress_level, index)
     else:
-        return TarFile(absfilepath, tempdir, mode)
+        return TarFile(absfilepath, tempdir, mode, parallel, workers, index)
 
 
 @contextmanager
@@ -95,6 +116,11 @@ def tardir(absfilepath: str,
            temp: bool = True,
            force: bool = True,
            withdir: bool = False,
+           parallel: bool = False,
+           workers: Optional[int] = None,
+           inmemory: bool = False,
+           compress_level: Optional[int] = None,
+           index: bool = False,
            **paths: Dict[str, Union[dict, str, TextIO, None]]) -> TarFile:
     """
     Create and return a tarfile directory.  This has the same
@@ -112,13 +138,20 @@ def tardir(absfilepath: str,
     :param temp: temporary file
     :param force: force create file
     :param withdir: if or not with dir in archive file
+    :param parallel: compress the archive in blocks concurrently (multi-member gzip, bz2 or xz streams, zstd frames)
+    :param workers: number of compression threads when parallel
+    :param inmemory: build archive members from in memory buffers instead of writing a temporary directory to disk,
+                     the yielded archive's tempdir is a MemoryDir
+    :param compress_level: zip archive deflate level, members are stored uncompressed when None
+    :param index: write an index sidecar of member offsets next to the archive, read by ArchiveIndex
     :param paths: directory paths objects
     :return:
     :rtype: TarFile
     """
     absdirpath = absfilepath.rsplit('/', 1)[0]
-    with tempdir(absdirpath) as temp_obj:
+    with nullcontext(MemoryDir()) if inmemory else tempdir(absdirpath) as temp_obj:
         temp_obj.create_structure(**paths)
-        with tartempdir(absfilepath, temp_obj, mode=mode, temp=temp, force=force) as tar_obj:
+        with tartempdir(absfilepath, temp_obj, mode=mode, temp=temp, force=force, parallel=parallel,
+                        workers=workers, compress_level=compress_level, index=index) as tar_obj:
             tar_obj.create_archive(withdir=withdir)
             yield tar_obj
@@ -0,0 +1,34 @@
+import zipfile
+from typing import Iterable, Tuple
+
+
+def append_compressed(zip_file: zipfile.ZipFile, members: Iterable[Tuple[zipfile.ZipInfo, bytes]]):
+    """
+    Append members whose data is already compressed to a zip file opened for writing, using a single write call.
+
+    ZipFile has no public method writing precompressed data, so this is the only place driving its private attributes
+    (_lock, _writing, _writecheck, fp, start_dir, _didModify, filelist & NameToInfo).  tests/test_open_zipwrite.py
+    covers them on every Python version CI runs.
+
+    :param zip_file: ZipFile opened in 'w', 'x' or 'a' mode
+    :param members: (ZipInfo, data) pairs, CRC, file_size, compress_size & compress_type must describe the data
+    """
+    with zip_file._lock:
+        if zip_file._writing:
+            raise ValueError("Can't write to the ZIP file while there is another write handle open on it.")
+        batch = bytearray()
+        for zinfo, data in members:
+            if not zinfo.external_attr:
+                zinfo.external_attr = 0o600 << 16
+            zinfo.header_offset = zip_file.start_dir + len(batch)
+            # Raises on a closed or read only zip file and warns about duplicate names
+            zip_file._writecheck(zinfo)
+            batch += zinfo.FileHeader()
+            batch += data
+            zip_file.filelist.append(zinfo)
+            zip_file.NameToInfo[zinfo.filename] = zinfo
+        if batch:
+            zip_file.fp.seek(zip_file.start_dir)
+            zip_file.fp.write(batch)
+            zip_file.start_dir += len(batch)
+            zip_file._didModify = True
@@ -0,0 +1,105 @@
+import os
+import sqlite3
+from time import time_ns
+
+
+class HashCache:
+
+    def __init__(self, path, algo='md5'):
+        """
+        Persistent cache of file hashes stored in a SQLite database.
+
+        Entries are keyed on (device, inode) and are only valid while the file's size and mtime_ns match the values
+        recorded when it was hashed, so a file is re-read only when it has changed.
+
+        :param path: SQLite database file path
+        :param algo: Hashing algorithm the cached digests were computed with
+        """
+        self.path = path
+        self.algo = algo
+        self._run = time_ns()
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS hashes ('
+                           'device INTEGER, inode INTEGER, algo TEXT, size INTEGER, mtime_ns INTEGER, digest TEXT, '
+                           'path TEXT, seen INTEGER, PRIMARY KEY (device, inode, algo))')
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute('SELECT COUNT(*) FROM hashes WHERE algo = ?', (self.algo, )).fetchone()[0]
+
+    @staticmethod
+    def _key(stat):
+        return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def lookup(self, paths):
+        """
+        Look up cached hashes for a list of file paths.
+
+        :param paths: List of file paths
+        :return: Tuple (dictionary of file_path, hash pairs found in the cache, list of (file_path, key) misses)
+        """
+        hashes, misses, seen = {}, [], []
+        for path in paths:
+            key = self._key(os.stat(path))
+            row = self._conn.execute(
+                'SELECT digest FROM hashes WHERE device = ? AND inode = ? AND algo = ? AND size = ? AND mtime_ns = ?',
+                (key[0], key[1], self.algo, key[2], key[3])).fetchone()
+            if row:
+                hashes[path] = row[0]
+                seen.append((self._run, os.path.abspath(path), key[0], key[1], self.algo))
+            else:
+                misses.append((path, key))
+        self._conn.executemany('UPDATE hashes SET seen = ?, path = ? WHERE device = ? AND inode = ? AND algo = ?',
+                               seen)
+        self._conn.commit()
+        return hashes, misses
+
+    def store(self, items):
+        """
+        Store newly computed hashes.
+
+        :param items: Iterable of (file_path, key, hash) tuples, keys are those returned by lookup()
+        """
+        self._conn.executemany(
+            'INSERT OR REPLACE INTO hashes (device, inode, algo, size, mtime_ns, digest, path, seen) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            ((key[0], key[1], self.algo, key[2], key[3], digest, os.path.abspath(path), self._run)
+             for path, key, digest in items))
+        self._conn.commit()
+
+    def evict(self, roots):
+        """
+        Remove entries for files beneath root directories that have been deleted or replaced.
+
+        Only entries not seen during this run are checked, so the cost is proportional to the number of files that
+        were not hashed (or found in the cache) this time.
+
+        :param roots: List of root directories that were scanned
+        :return: Number of entries removed
+        """
+        stale = []
+        for root in roots:
+            prefix = os.path.join(os.path.abspath(root), '')
+            rows = self._conn.execute(
+                'SELECT device, inode, path FROM hashes WHERE algo = ? AND seen != ? AND substr(path, 1, ?) = ?',
+                (self.algo, self._run, len(prefix), prefix)).fetchall()
+            for device, inode, path in rows:
+                try:
+                    stat = os.stat(path)
+                    if (stat.st_dev, stat.st_ino) == (device, inode):
+                        continue
+                except OSError:
+                    pass
+                stale.append((device, inode, self.algo))
+        self._conn.executemany('DELETE FROM hashes WHERE device = ? AND inode = ? AND algo = ?', stale)
+        self._conn.commit()
+        return len(stale)
+
+    def close(self):
+        self._conn.close()
@@ -1,4 +1,162 @@
 import os
+import re
+
+
+def compile_patterns(patterns):
+    """
+    Compile substring patterns into a single lowercase regex that matches if any pattern is found in a string.
+
+    Patterns are merged into a trie so that shared prefixes are only tested once, which keeps matching against
+    hundreds of patterns cheap.  Returns None when there are no patterns.
+    """
+    if not patterns:
+        return None
+    trie = {}
+    for pattern in patterns:
+        node = trie
+        for char in str(pattern).lower():
+            node = node.setdefault(char, {})
+        # A shorter pattern matching is enough, longer patterns sharing its prefix are not needed
+        node.clear()
+        node[''] = True
+
+    def build(node):
+        if '' in node:
+            return ''
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items())]
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    return re.compile(build(trie))
+
+
+def translate_segment(segment):
+    """Translate a single glob path segment into a regex, wildcards never match the path separator."""
+    i, n, regex = 0, len(segment), ''
+    while i < n:
+        char = segment[i]
+        i += 1
+        if char == '*':
+            regex += '[^/]*'
+        elif char == '?':
+            regex += '[^/]'
+        elif char == '\\' and i < n:
+            regex += re.escape(segment[i])
+            i += 1
+        elif char == '[':
+            j = i + 1 if i < n and segment[i] in '!^' else i
+            j = j + 1 if j < n and segment[j] == ']' else j
+            end = segment.find(']', j)
+            if end == -1:
+                regex += '\\['
+            else:
+                chars = segment[i:end]
+                i = end + 1
+                if chars[0] in '!^':
+                    chars = '^' + chars[1:].replace('\\', '\\\\')
+                else:
+                    chars = chars.replace('\\', '\\\\')
+                regex += '[' + chars + ']'
+        else:
+            regex += re.escape(char)
+    return regex
+
+
+class _Rule:
+
+    def __init__(self, pattern):
+        """A single gitignore style pattern."""
+        self.pattern = pattern
+        self.negate = pattern.startswith('!')
+        if self.negate:
+            pattern = pattern[1:]
+        elif pattern.startswith('\\!') or pattern.startswith('\\#'):
+            pattern = pattern[1:]
+
+        self.dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+
+        # Patterns containing a separator are relative to the root, others match a name at any level
+        self.anchored = '/' in pattern
+        self.segments = pattern.lstrip('/').split('/') if self.anchored else ['**', pattern]
+        self._segments = [None if seg == '**' else re.compile(translate_segment(seg)) for seg in self.segments]
+
+        regex = ''
+        for i, seg in enumerate(self.segments):
+            last = i == len(self.segments) - 1
+            if seg == '**':
+                regex += '.*' if last else '(?:.*/)?'
+            else:
+                regex += translate_segment(seg) + ('' if last else '/')
+        self._regex = re.compile(regex)
+
+    def __repr__(self):
+        return '<_Rule {0}>'.format(self.pattern)
+
+    def match(self, path, is_dir=False):
+        """Return True if the rule matches a '/' separated relative path."""
+        return (is_dir or not self.dir_only) and self._regex.fullmatch(path) is not None
+
+    def match_below(self, components):
+        """Return True if the rule could match a path beneath the directory made up of components."""
+        for i, component in enumerate(components):
+            if i >= len(self._segments):
+                return False
+            if self._segments[i] is None:
+                return True
+            if not self._segments[i].fullmatch(component):
+                return False
+        return len(self._segments) > len(components)
+
+
+class PatternFilters:
+
+    def __init__(self, patterns):
+        """
+        Filter paths with gitignore style patterns such as '**/*.log', 'build/' and '!keep.txt'.
+
+        A path is excluded when the last pattern matching it is not negated, or when any of its parent directories
+        is excluded.  Rules are compiled per directory as the tree is descended, dropping any rule that can't match
+        beneath it, so deep paths are only tested against the rules that could apply to them.
+
+        :param patterns: List of patterns or a newline separated string of patterns
+        """
+        if isinstance(patterns, str):
+            patterns = patterns.splitlines()
+        self.patterns = [p.rstrip() for p in patterns if p.strip() and not p.startswith('#')]
+        self.rules = tuple(_Rule(p) for p in self.patterns)
+        self._directories = {'': (False, self.rules)}
+
+    @staticmethod
+    def _normalize(path):
+        return path.replace(os.sep, '/').strip('/')
+
+    def _last_match(self, rules, path, is_dir):
+        for rule in reversed(rules):
+            if rule.match(path, is_dir):
+                return not rule.negate
+        return False
+
+    def _directory(self, path):
+        """Return an (excluded, rules that can match beneath) tuple for a normalized directory path."""
+        if path not in self._directories:
+            parent = path.rsplit('/', 1)[0] if '/' in path else ''
+            parent_excluded, parent_rules = self._directory(parent)
+            excluded = parent_excluded or self._last_match(parent_rules, path, True)
+            components = path.split('/')
+            rules = () if excluded else tuple(r for r in parent_rules if not r.anchored or r.match_below(components))
+            self._directories[path] = (excluded, rules)
+        return self._directories[path]
+
+    def excluded(self, path, is_dir=False):
+        """Return True if a path is excluded by the patterns."""
+        path = self._normalize(path)
+        if not path:
+            return False
+        if is_dir:
+            return self._directory(path)[0]
+        parent = path.rsplit('/', 1)[0] if '/' in path else ''
+        parent_excluded, rules = self._directory(parent)
+        return parent_excluded or self._last_match(rules, path, False)
 
 
 class PathFilters:
@@ -9,7 +167,8 @@ class PathFilters:
                  min_level=0,
                  max_level=12,
                  filters=None,
-                 non_empty_folders=None):
+                 non_empty_folders=None,
+                 patterns=None):
         self.to_include = to_include
         self.to_exclude = to_exclude
         self.min_level = min_level
@@ -17,6 +176,15 @@ class PathFilters:
         self.filters = filters
         self.non_empty_folders = non_empty_folders
 
+        # Compile filters once rather than lowercasing every pattern for every path
+        self._exclude = compile_patterns(to_exclude)
+        self._include = compile_patterns(to_include)
+        self._levels = {
+            level: (compile_patterns(f.get('exclude')), compile_patterns(f.get('include')))
+            for level, f in (filters or {}).items()
+        }
+        self.patterns = PatternFilters(patterns) if patterns else None
+
     @staticmethod
     def get_level(path):
         return len(path.split(os.sep))
@@ -27,20 +195,14 @@ class PathFilters:
             return True
 
     def _level_filters(self, path):
-        path_list = path.split(os.sep)
+        path_list = path.lower().split(os.sep)
         for i in range(0, len(path_list)):
-            if i in self.filters:
-                if 'exclude' in self.filters[i]:
-                    if any(ex.lower() in path_list[i].lower() for ex in self.filters[i]['exclude']):
-                        return False
-
-                if 'include' in self.filters[i]:
-                    inclusion = 0
-                    for inc in self.filters[i]['include']:
-                        if str(inc).lower() in path_list[i].lower():
-                            inclusion = 1
-                    if inclusion != 1:
-                        return False
+            if i in self._levels:
+                exclude, include = self._levels[i]
+                if exclude and exclude.search(path_list[i]):
+                    return False
+                if include and not include.search(path_list[i]):
+                    return False
         return True
 
     def validate_non_empty_folder(self, base, fullname):
@@ -52,6 +214,28 @@ class PathFilters:
                 if self.filters.get_level(fullname) == self.filters.max_level:
                     return True
 
+    def descend(self, path):
+        """
+        Return False if no file beneath a directory path can pass the filters, so the subtree can be pruned.
+
+        Only filters that also reject every descendant of a rejected directory are considered: max_level, to_exclude,
+        the per-level filters and patterns.  to_include, min_level and hidden names can still match deeper paths.
+        """
+        level = self.get_level(path)
+        if level > self.max_level or (level == self.max_level and not self.non_empty_folders):
+            return False
+
+        if self.filters:
+            if not self._level_filters(path):
+                return False
+
+        if self._exclude and self._exclude.search(path.lower()):
+            return False
+
+        if self.patterns and self.patterns.excluded(path, is_dir=True):
+            return False
+        return True
+
     def validate(self, path):
         """Run path against filter sets and return True if all pass"""
         # Exclude hidden files and folders with '.' prefix
@@ -66,15 +250,15 @@ class PathFilters:
             if not self._level_filters(path):
                 return False
 
-        # Force include and exclude iterations to be strings in case of integer filters
-        # Handle exclusions
-        if self.to_exclude:
-            if any(str(ex).lower() in path.lower() for ex in self.to_exclude):
+        # Handle exclusions & inclusions with the compiled patterns
+        if self._exclude or self._include:
+            lowered = path.lower()
+            if self._exclude and self._exclude.search(lowered):
                 return False
-
-        # Handle inclusions
-        if self.to_include:
-            if not any(str(inc).lower() in path.lower() for inc in self.to_include):
+            if self._include and not self._include.search(lowered):
                 return False
 
+        if self.patterns and self.patterns.excluded(path):
+            return False
+
         return True
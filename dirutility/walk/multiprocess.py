@@ -1,33 +1,103 @@
 import os
-from multiprocessing import Manager
+from collections import deque
 from multiprocessing.pool import Pool
+from queue import Queue
+
+from dirutility.walk.result import WalkResult, file_batch
+from dirutility.walk.scandir import scandir
+
+# Maximum number of directories a worker explores before handing its unexplored directories back
+BUDGET = 64
+
+
+def explore_path(base, path, filters, full_paths, stat=False):
+    """
+    Explore path to discover unsearched directories and files
+    :param base: Base directory
+    :param path: Path relative to the base directory
+    :param filters: PathFilters object or False
+    :param full_paths: Bool, when true absolute file paths are returned
+    :param stat: Bool, when true files are returned as a WalkResult
+    :return: Tuple (directories, files), directories are (base, path) tuples
+    """
+    directories = []
+    files = []
+    if filters and not filters.validate(path):
+        return directories, file_batch(files, stat)
+
+    subdirs, nondirs = scandir(os.path.join(base, path))
+    for entry in subdirs:
+        fullname = os.path.join(path, entry.name)
+        if filters and not filters.validate(fullname):
+            continue
+        # Check that non-empty folders flag is on and we're at the max directory level
+        if filters and filters.non_empty_folders and filters.get_level(fullname) == filters.max_level:
+            # Check that the folder contains files and not just directories
+            if scandir(entry.path)[1]:
+                files.append((fullname, entry))
+        # Skip enqueueing directories that can't contain matches
+        elif not entry.is_symlink() and (not filters or filters.descend(fullname)):
+            directories.append((base, fullname))
+
+    for entry in nondirs:
+        fullname = os.path.join(path, entry.name)
+        if filters and not filters.validate(fullname):
+            continue
+        if not (filters and filters.non_empty_folders and filters.get_level(fullname) == filters.max_level):
+            files.append((fullname, entry))
+
+    if full_paths:
+        files = [(os.path.join(base, f), entry) for f, entry in files]
+    return directories, file_batch(files, stat)
+
+
+def explore_batch(task):
+    """
+    Explore a batch of directories within a worker process, depth first, without any inter-process communication.
+
+    Discovered file paths are collected locally and returned in a single chunk.  Once the budget of explored
+    directories is spent the remaining unexplored directories are returned so they can be shared with idle workers.
+
+    :param task: Tuple (batch, filters, full_paths, stat, budget, printer)
+    :return: Tuple (files, unexplored directories)
+    """
+    batch, filters, full_paths, stat, budget, _printer = task
+    stack = list(reversed(batch))
+    files = WalkResult() if stat else []
+    explored = 0
+    while stack and explored < budget:
+        base, path = stack.pop()
+        _printer("Task: " + str(os.getpid()) + " >>> Explored path: " + path, stream=True)
+        directories, nondirectories = explore_path(base, path, filters, full_paths, stat)
+        files.extend(nondirectories)
+        stack.extend(reversed(directories))
+        explored += 1
+    return files, stack
 
 
 class Sprinter:
 
-    def __init__(self, directory, filters, full_paths, pool_size, _printer):
+    def __init__(self, directory, filters, full_paths, pool_size, _printer, stat=False):
         """DirPaths sub class for directory parsing using parallel processing."""
         self.directory = directory
         self.filters = filters
+        self.full_paths = full_paths
+        self.stat = stat
         self.pool_size = pool_size
         self._printer = _printer
 
         if self.filters:
             self._printer('Filtering enabled')
-            self.explore_path = self.explore_path_filter
         else:
             self._printer('Filtering disabled')
-            self.explore_path = self.explore_path_encompass
 
-        self.filepaths = Manager().list()
-        self.unsearched = Manager().Queue()
+        self.filepaths = []
+        self.unsearched = deque()
 
         if full_paths:
             self._printer('Absolute paths')
-            self.add_path = self._add_filepath_absolute
         else:
             self._printer('Relative paths')
-            self.add_path = self._add_filepath_relative
 
     def __iter__(self):
         return iter(self.filepaths)
@@ -35,118 +105,73 @@ class Sprinter:
     def __len__(self):
         return len(self.filepaths)
 
-    def _add_filepath_relative(self, paths):
-        for directory, fullname in paths:
-            self.filepaths.append(fullname)
-
-    def _add_filepath_absolute(self, paths):
-        for directory, fullname in paths:
-            self.filepaths.append(os.path.join(directory, fullname))
-
     def _get_root_files(self, directory):
         """Retrieve files within the root directory"""
-        if len(self.filepaths) == 0:
-            if self.filters:
-                root_files = [(directory, f) for f in os.listdir(directory)
-                              if os.path.isfile(os.path.join(directory, f)) and self.filters.validate(f)
-                              and self.filters.get_level(f) == self.filters.max_level]
-            else:
-                root_files = [(directory, f) for f in os.listdir(directory)
-                              if os.path.isfile(os.path.join(directory, f))]
-            self.add_path(root_files)
-
-    def explore_path_filter(self, task_num, dirpath):
-        """
-        Explore path to discover unsearched directories and save filepaths
-        :param task_num: Processor ID
-        :param dirpath: Tuple (base directory, path), path information pulled from unsearched Queue
-        :return: Directories to add to unsearched Queue
-        """
-        base, path = dirpath
-        directories = []
-        nondirectories = []
-        if self.filters.validate(path):
-            self._printer("Task: " + str(task_num) + " >>> Explored path: " + path, stream=True)
-            # Loop through paths
-            for filename in os.listdir(base + os.sep + path):
-                fullname = os.path.join(path, filename)
-                if self.filters.validate(fullname):
-                    # Check that non-empty folders flag is on and we're at the max directory level
-                    if self.filters.non_empty_folders and self.filters.get_level(fullname) == self.filters.max_level:
-                        # Check that the path is not an empty folder
-                        if os.path.isdir(base + os.sep + fullname):
-                            # Get paths in folder without walking directory
-                            paths = os.listdir(base + os.sep + fullname)
-
-                            # Check that any of the paths are files and not just directories
-                            if paths and any(os.path.isfile(os.path.join(base, fullname, p)) for p in paths):
-                                nondirectories.append((base, fullname))
-                    else:
-                        # Append to directories if dir
-                        if os.path.isdir(base + os.sep + fullname):
-                            directories.append((base, fullname))
-                        # Pass filters and append to nondirectories if file
-                        elif self.filters.validate(fullname):
-                            nondirectories.append((base, fullname))
-            self.add_path(nondirectories)
-        return directories
-
-    def explore_path_encompass(self, task_num, dirpath):
-        """
-        Explore path to discover unsearched directories and save filepaths
-        :param task_num: Processor ID
-        :param dirpath: Tuple (base directory, path), path information pulled from unsearched Queue
-        :return: Directories to add to unsearched Queue
-        """
-        base, path = dirpath
-        directories = []
-        nondirectories = []
-        self._printer("Task: " + str(task_num) + " >>> Explored path: " + path, stream=True)
-        # Loop through paths
-        for filename in os.listdir(base + os.sep + path):
-            fullname = os.path.join(path, filename)
-            # Append to directories if dir
-            if os.path.isdir(base + os.sep + fullname):
-                directories.append((base, fullname))
-            # Pass filters and append to nondirectories if file
-            else:
-                nondirectories.append((base, fullname))
-        self.add_path(nondirectories)
-        return directories
-
-    def parallel_worker(self, task_num):
-        """
-        Continuously pulls directories from the Queue until it is empty.
-        Gets child directories from parent and adds them to Queue.
-        Executes task_done() to remove directory from unsearched Queue
-        :param task_num: Processor ID
-        """
-        while True:
-            base, path = self.unsearched.get()
-            dirs = self.explore_path(task_num, (base, path))
-            for newdir in dirs:
-                self.unsearched.put(newdir)
-            self.unsearched.task_done()
+        # The root directory itself is gated like every other directory, as the walk & scandir engines do
+        if self.filters and not self.filters.validate(''):
+            return file_batch([], self.stat)
+        root_files = [(f.name, f) for f in scandir(directory)[1]]
+        if self.filters:
+            root_files = [(f, entry) for f, entry in root_files if self.filters.validate(f)]
+        if self.full_paths:
+            root_files = [(os.path.join(directory, f), entry) for f, entry in root_files]
+        return file_batch(root_files, self.stat)
 
-    def sprinter(self):
+    def _next_batch(self, idle):
+        """Take an even share of the unsearched directories for one of the idle workers."""
+        share = max(1, len(self.unsearched) // idle)
+        return [self.unsearched.popleft() for _ in range(min(share, len(self.unsearched)))]
+
+    def batches(self):
         """
-        Called when parallelize is True.
-        This function will generate the file names in a directory tree by adding directories to a Queue and
-        continuously exploring directories in the Queue until Queue is emptied.
-        Significantly faster than crawler method for larger directory trees.
+        Generate lists of file paths as worker processes return them.
+
+        Batches of unsearched directories are distributed to worker processes.  Each worker walks its batch locally
+        and returns discovered files in one chunk along with any directories it did not have the budget to explore,
+        which are then re-shared with idle workers.  Batches are yielded in the order workers complete them.
         """
         self._printer('Multiprocess Walk')
         # Loop through directories in case there is more than one (1)
+        root_files = []
         for directory in self.directory:
-            self._get_root_files(directory)    # Add file within root directory if filepaths is empty
+            # Add files within the root directory if none have been found yet
+            if not root_files:
+                root_files = self._get_root_files(directory)
+                if root_files:
+                    yield root_files
             # acquire the list of paths
-            first_level_dirs = next(os.walk(directory))[1]
-            for path in first_level_dirs:
-                self.unsearched.put((directory, path))
+            for entry in scandir(directory)[0]:
+                if not entry.is_symlink():
+                    self.unsearched.append((directory, entry.name))
+
         self._printer('Pool Processing STARTED')
-        pool = Pool(self.pool_size)
-        pool.map_async(self.parallel_worker, range(self.pool_size))
-        pool.close()
-        self.unsearched.join()
+        results = Queue()
+        with Pool(self.pool_size) as pool:
+            pending = 0
+            while self.unsearched or pending:
+                # Hand out work to every idle worker
+                while self.unsearched and pending < self.pool_size:
+                    task = (self._next_batch(self.pool_size - pending), self.filters, self.full_paths, self.stat,
+                            BUDGET, self._printer)
+                    pool.apply_async(explore_batch, (task, ), callback=results.put, error_callback=results.put)
+                    pending += 1
+
+                result = results.get()
+                pending -= 1
+                if isinstance(result, BaseException):
+                    raise result
+                files, unexplored = result
+                self.unsearched.extend(unexplored)
+                if files:
+                    yield files
         self._printer('Pool Processing ENDED')
+
+    def sprinter(self):
+        """
+        Called when parallelize is True.
+        This function will generate the file names in a directory tree by distributing batches of unsearched
+        directories to worker processes.  Significantly faster than crawler method for larger directory trees.
+        """
+        for files in self.batches():
+            self.filepaths.extend(files)
         return self.filepaths
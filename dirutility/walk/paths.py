@@ -0,0 +1,126 @@
+import os
+from array import array
+
+
+class CompactPaths:
+
+    def __init__(self, paths=()):
+        """
+        Memory compact container of file paths.
+
+        Each distinct directory is stored once in a directory table.  Files are stored as the index of their
+        directory plus their basename, with basenames packed into a single byte buffer addressed by an offset array.
+        A file costs roughly its basename length plus 12 bytes instead of a full path string object, and path strings
+        are only created when the container is iterated.
+
+        Membership tests and set differences sort an array of file indices by directory and basename on first use and
+        binary search it, adding 4 bytes per file.  Adding paths discards the index, it's rebuilt on the next lookup.
+
+        :param paths: Iterable of file paths
+        """
+        self._directories = []
+        self._directory_index = {}
+        self._parents = array('I')
+        self._names = bytearray()
+        self._offsets = array('Q', [0])
+        self._index = None
+        self.update(paths)
+
+    def __len__(self):
+        return len(self._parents)
+
+    def __iter__(self):
+        for i, parent in enumerate(self._parents):
+            yield os.path.join(self._directories[parent], self._name(i))
+
+    def __contains__(self, path):
+        directory, name = os.path.split(path)
+        parent = self._directory_index.get(directory)
+        if parent is None:
+            return False
+        return self._find(parent, os.fsencode(name))
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def __str__(self):
+        return str(list(self))
+
+    def _name(self, i):
+        return os.fsdecode(bytes(self._names[self._offsets[i]:self._offsets[i + 1]]))
+
+    def _key(self, i):
+        """Return the sort key of a file, its directory index as 4 big endian bytes followed by its encoded basename."""
+        return self._parents[i].to_bytes(4, 'big') + self._names[self._offsets[i]:self._offsets[i + 1]]
+
+    def _get_index(self):
+        """Return an array of file indices sorted by directory index and encoded basename."""
+        if self._index is None:
+            self._index = array('I', sorted(range(len(self._parents)), key=self._key))
+        return self._index
+
+    def _find(self, parent, name):
+        """Return True if a file with an encoded basename is within a directory index, found by binary search."""
+        key = parent.to_bytes(4, 'big') + name
+        index = self._get_index()
+        lo, hi = 0, len(index)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(index[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < len(index) and self._key(index[lo]) == key
+
+    def add(self, path):
+        """Add a file path."""
+        directory, name = os.path.split(path)
+        parent = self._directory_index.get(directory)
+        if parent is None:
+            parent = self._directory_index[directory] = len(self._directories)
+            self._directories.append(directory)
+        self._parents.append(parent)
+        self._names += os.fsencode(name)
+        self._offsets.append(len(self._names))
+        self._index = None
+
+    def update(self, paths):
+        """Add an iterable of file paths."""
+        for path in paths:
+            self.add(path)
+
+    # Allows walk engines to extend a CompactPaths with batches the same way they extend a list
+    extend = update
+
+    def directories(self):
+        """Return the list of distinct directories."""
+        return list(self._directories)
+
+    def difference(self, other):
+        """Return a new CompactPaths holding the paths not within other (a CompactPaths or iterable of paths)."""
+        if not isinstance(other, CompactPaths):
+            other = CompactPaths(other)
+        # Files are sorted by their key within other and merged with its index, files in directories other doesn't
+        # hold are kept without a lookup
+        parents = [other._directory_index.get(directory) for directory in self._directories]
+
+        def key(i):
+            return parents[self._parents[i]].to_bytes(4, 'big') + self._names[self._offsets[i]:self._offsets[i + 1]]
+
+        candidates = sorted((i for i, parent in enumerate(self._parents) if parents[parent] is not None), key=key)
+        removed = bytearray(len(self))
+        index = other._get_index()
+        j = 0
+        for i in candidates:
+            self_key = key(i)
+            while j < len(index) and other._key(index[j]) < self_key:
+                j += 1
+            if j == len(index):
+                break
+            removed[i] = other._key(index[j]) == self_key
+
+        result = CompactPaths()
+        for i, parent in enumerate(self._parents):
+            if not removed[i]:
+                result.add(os.path.join(self._directories[parent], self._name(i)))
+        return result
@@ -0,0 +1,161 @@
+import heapq
+import os
+import platform
+from array import array
+
+COLUMNS = ('size', 'mtime_ns', 'mode', 'inode', 'created_ns')
+
+SYSTEM = platform.system()
+
+
+def creation_time_ns(stat):
+    """
+    Return a file's creation time in nanoseconds from an os.stat_result.
+
+    Falls back to the last modification time on platforms (Linux) that don't expose a creation time.
+    """
+    if SYSTEM == 'Windows':
+        return stat.st_ctime_ns
+    try:
+        return int(stat.st_birthtime * 10 ** 9)
+    except AttributeError:
+        return stat.st_mtime_ns
+
+
+class WalkResult:
+
+    def __init__(self):
+        """
+        Columnar walk result holding file paths alongside array backed size, mtime_ns, mode, inode and created_ns
+        columns.
+
+        Iterating a WalkResult yields file paths, so it can be used anywhere a list of paths is expected.  Sorting and
+        filtering operate on the columns and return a new WalkResult without re-stat'ing any file.
+        """
+        self.paths = []
+        self.size = array('q')
+        self.mtime_ns = array('q')
+        self.mode = array('L')
+        self.inode = array('Q')
+        self.created_ns = array('q')
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __getitem__(self, index):
+        return self.paths[index]
+
+    def __str__(self):
+        return str(self.paths)
+
+    def append(self, path, stat):
+        """Append a file path and its os.stat_result."""
+        self.paths.append(path)
+        self.size.append(stat.st_size)
+        self.mtime_ns.append(stat.st_mtime_ns)
+        self.mode.append(stat.st_mode)
+        self.inode.append(stat.st_ino)
+        self.created_ns.append(creation_time_ns(stat))
+
+    def extend(self, other):
+        """Extend with the rows of another WalkResult."""
+        self.paths.extend(other.paths)
+        for column in COLUMNS:
+            getattr(self, column).extend(getattr(other, column))
+
+    def take(self, indices):
+        """Return a new WalkResult containing the rows at a list of indices."""
+        result = WalkResult()
+        result.paths = [self.paths[i] for i in indices]
+        for column in COLUMNS:
+            values = getattr(self, column)
+            setattr(result, column, array(values.typecode, (values[i] for i in indices)))
+        return result
+
+    def row(self, index):
+        """Return a dictionary of the path and column values of a single row."""
+        values = {column: getattr(self, column)[index] for column in COLUMNS}
+        values['path'] = self.paths[index]
+        return values
+
+    def sort(self, by='size', reverse=False):
+        """
+        Return a new WalkResult sorted by a column.
+
+        :param by: Column name, one of size, mtime_ns, mode, inode, created_ns or path
+        :param reverse: Bool, when true rows are sorted in descending order
+        """
+        column = self.paths if by == 'path' else getattr(self, by)
+        return self.take(sorted(range(len(self)), key=column.__getitem__, reverse=reverse))
+
+    def newest(self, n, by='created_ns'):
+        """
+        Return a new WalkResult of the n rows with the largest values in a column, largest first.
+
+        A heap is used so only n rows are kept in order rather than sorting every row.
+        """
+        column = getattr(self, by)
+        return self.take(heapq.nlargest(n, range(len(self)), key=column.__getitem__))
+
+    def filter(self, min_size=None, max_size=None, newer_than=None, older_than=None, files_only=False):
+        """
+        Return a new WalkResult containing only the rows that match every given condition.
+
+        :param min_size: Minimum size in bytes
+        :param max_size: Maximum size in bytes
+        :param newer_than: Minimum mtime_ns
+        :param older_than: Maximum mtime_ns
+        :param files_only: Bool, when true only regular files are kept
+        """
+        conditions = []
+        if min_size is not None:
+            conditions.append((self.size, lambda v: v >= min_size))
+        if max_size is not None:
+            conditions.append((self.size, lambda v: v <= max_size))
+        if newer_than is not None:
+            conditions.append((self.mtime_ns, lambda v: v >= newer_than))
+        if older_than is not None:
+            conditions.append((self.mtime_ns, lambda v: v <= older_than))
+        if files_only:
+            conditions.append((self.mode, lambda v: (v & 0o170000) == 0o100000))
+
+        indices = range(len(self))
+        for column, condition in conditions:
+            indices = [i for i in indices if condition(column[i])]
+        return self.take(indices)
+
+    def total_size(self):
+        """Return the combined size of every file in bytes."""
+        return sum(self.size)
+
+
+def file_batch(entries, stat=False):
+    """
+    Return a batch of walked file paths from (file_path, os.DirEntry) pairs.
+
+    Dangling symlinks are recorded with the stats of the link itself and files removed since they were listed are
+    left out of stat batches.
+
+    :param entries: List of (file_path, DirEntry) pairs, a path to stat may be given in place of the DirEntry
+    :param stat: Bool, when true a WalkResult is returned instead of a list of file paths
+    """
+    if not stat:
+        return [path for path, entry in entries]
+    result = WalkResult()
+    for path, entry in entries:
+        try:
+            result.append(path, entry_stat(entry))
+        except OSError:
+            continue
+    return result
+
+
+def entry_stat(entry):
+    """Return the stats of a path or DirEntry, falling back to the stats of a symlink whose target is missing."""
+    try:
+        return os.stat(entry) if isinstance(entry, str) else entry.stat()
+    except OSError:
+        return os.lstat(entry) if isinstance(entry, str) else entry.stat(follow_symlinks=False)
@@ -0,0 +1,144 @@
+import os
+
+from looptools import Counter
+
+from dirutility.walk.result import file_batch
+
+
+def scandir(path):
+    """
+    Return a (directories, files) tuple of DirEntry lists for the contents of a directory.
+
+    Entries are classified using the DirEntry d_type cache so no additional stat calls are made (unless the
+    filesystem does not report d_type or the entry is a symbolic link).  Unreadable directories are treated as empty.
+    """
+    directories, files = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    directories.append(entry)
+                else:
+                    files.append(entry)
+    except OSError:
+        pass
+    return directories, files
+
+
+def walk(top, topdown=True):
+    """
+    Directory tree generator similar to os.walk() that yields DirEntry lists instead of names.
+
+    For each directory in the tree rooted at top (including top itself) a 3-tuple (dirpath, directories, files) is
+    yielded.  When walking top-down the directories list may be modified in place to prune the walk.  Symbolic links
+    to directories are listed in directories but not descended into.
+    """
+    stack = [top]
+    while stack:
+        top = stack.pop()
+
+        # Bottom-up results are pushed back onto the stack until their children have been yielded
+        if isinstance(top, tuple):
+            yield top
+            continue
+
+        directories, files = scandir(top)
+        if topdown:
+            yield top, directories, files
+        else:
+            stack.append((top, directories, files))
+        stack.extend(reversed([d.path for d in directories if not d.is_symlink()]))
+
+
+class Scanner:
+
+    def __init__(self, directory, filters, full_paths, topdown, _printer, stat=False):
+        """Sub class of DirPaths used for sequential directory parsing using os.scandir"""
+        self.directory = directory
+        self.filters = filters
+        self.topdown = topdown
+        self.stat = stat
+        self._printer = _printer
+
+        self.filepaths = []
+
+        if full_paths:
+            self.get_path = self._get_filepath_absolute
+            self._printer('Absolute paths')
+        else:
+            self.get_path = self._get_filepath_relative
+            self._printer('Relative paths')
+
+    def __iter__(self):
+        return iter(self.filepaths)
+
+    def __len__(self):
+        return len(self.filepaths)
+
+    @staticmethod
+    def _get_filepath_relative(directory, fullname):
+        return fullname
+
+    @staticmethod
+    def _get_filepath_absolute(directory, fullname):
+        return os.path.join(directory, fullname)
+
+    def batches(self):
+        """Generate lists of file paths, one list per explored directory."""
+        if self.filters:
+            self._printer('Filtering enabled')
+            return self.filter()
+        else:
+            self._printer('Filtering disabled')
+            return self.encompass()
+
+    def scanner(self):
+        for files in self.batches():
+            self.filepaths.extend(files)
+        return self.filepaths
+
+    def encompass(self):
+        """
+        Called when parallelize is False and the scandir engine is selected.
+        This function will generate lists of file names in a directory tree by scanning each directory exactly once,
+        classifying entries using the DirEntry d_type cache rather than stat'ing every path.
+        """
+        self._printer('Scandir Walk')
+        count = Counter(length=3)
+        for directory in self.directory:
+            for root, directories, files in walk(directory, topdown=self.topdown):
+                root = root[len(str(directory)) + 1:]
+                self._printer(str(count.up) + ": Explored path - " + str(root), stream=True)
+                yield file_batch([(self.get_path(directory, os.path.join(root, entry.name)), entry) for entry in files],
+                                 self.stat)
+
+    def filter(self):
+        """
+        Called when parallelize is False and the scandir engine is selected.
+        This function will generate lists of file names in a directory tree by scanning each directory exactly once
+        and running each path against the filters.
+        """
+        self._printer('Scandir Walk')
+        count = Counter(length=3)
+        for directory in self.directory:
+            self._printer('Searching ' + directory)
+            for root, directories, files in walk(directory, topdown=self.topdown):
+                root = root[len(str(directory)) + 1:]
+                self._printer(str(count.up) + ": Explored path - " + str(root), stream=True)
+                # Prune sub directories that can't contain matches (only possible when walking top-down)
+                if self.topdown:
+                    directories[:] = [d for d in directories if self.filters.descend(os.path.join(root, d.name))]
+                if self.filters.validate(root):
+                    # Check that non-empty folders flag is on and we're at the max directory level
+                    if self.filters.non_empty_folders and self.filters.get_level(root) == self.filters.max_level:
+                        # Check that the folder contains files and not just directories
+                        if files:
+                            yield file_batch([(self.get_path(directory, root), os.path.join(directory, root))],
+                                             self.stat)
+
+                    else:
+                        yield file_batch([
+                            (self.get_path(directory, fullname), entry)
+                            for fullname, entry in ((os.path.join(root, entry.name), entry) for entry in files)
+                            if self.filters.validate(fullname)
+                        ], self.stat)
@@ -15,10 +15,10 @@ class Crawler:
         self.filepaths = []
 
         if full_paths:
-            self.add_path = self._add_filepath_absolute
+            self.get_path = self._get_filepath_absolute
             self._printer('Absolute paths')
         else:
-            self.add_path = self._add_filepath_relative
+            self.get_path = self._get_filepath_relative
             self._printer('Relative paths')
 
     def __iter__(self):
@@ -27,27 +27,34 @@ class Crawler:
     def __len__(self):
         return len(self.filepaths)
 
-    def _add_filepath_relative(self, directory, fullname):
-        self.filepaths.append(fullname)
+    @staticmethod
+    def _get_filepath_relative(directory, fullname):
+        return fullname
 
-    def _add_filepath_absolute(self, directory, fullname):
-        self.filepaths.append(os.path.join(directory, fullname))
+    @staticmethod
+    def _get_filepath_absolute(directory, fullname):
+        return os.path.join(directory, fullname)
 
-    def crawler(self):
+    def batches(self):
+        """Generate lists of file paths, one list per explored directory."""
         if self.filters:
             self._printer('Filtering enabled')
-            self.filter()
+            return self.filter()
         else:
             self._printer('Filtering disabled')
-            self.encompass()
+            return self.encompass()
+
+    def crawler(self):
+        for files in self.batches():
+            self.filepaths.extend(files)
         return self.filepaths
 
     def encompass(self):
         """
         Called when parallelize is False.
         This function will generate the file names in a directory tree by walking the tree either top-down or
-        bottom-up. For each directory in the tree rooted at directory top (including top itself), it yields a 3-tuple
-        (dirpath, dirnames, filenames).
+        bottom-up. For each directory in the tree rooted at directory top (including top itself), it yields a list of
+        the file paths within it.
         """
         self._printer('Standard Walk')
         count = Counter(length=3)
@@ -55,17 +62,15 @@ class Crawler:
             for root, directories, files in os.walk(directory, topdown=self.topdown):
                 root = root[len(str(directory)) + 1:]
                 self._printer(str(count.up) + ": Explored path - " + str(root), stream=True)
-                for filename in files:
-                    fullname = os.path.join(root, filename)
-                    # Join the two strings in order to form the full filepath.
-                    self.add_path(directory, fullname)
+                # Join the two strings in order to form the full filepath.
+                yield [self.get_path(directory, os.path.join(root, filename)) for filename in files]
 
     def filter(self):
         """
         Called when parallelize is False.
         This function will generate the file names in a directory tree by walking the tree either top-down or
-        bottom-up. For each directory in the tree rooted at directory top (including top itself), it yields a 3-tuple
-        (dirpath, dirnames, filenames).
+        bottom-up. For each directory in the tree rooted at directory top (including top itself), it yields a list of
+        the file paths within it.
         """
         self._printer('Standard Walk')
         count = Counter(length=3)
@@ -74,6 +79,9 @@ class Crawler:
             for root, directories, files in os.walk(directory, topdown=self.topdown):
                 root = root[len(str(directory)) + 1:]
                 self._printer(str(count.up) + ": Explored path - " + str(root), stream=True)
+                # Prune sub directories that can't contain matches (only possible when walking top-down)
+                if self.topdown:
+                    directories[:] = [d for d in directories if self.filters.descend(os.path.join(root, d))]
                 if self.filters.validate(root):
                     # Check that non-empty folders flag is on and we're at the max directory level
                     if self.filters.non_empty_folders and self.filters.get_level(root) == self.filters.max_level:
@@ -84,11 +92,12 @@ class Crawler:
 
                             # Check that any of the paths are files and not just directories
                             if paths and any(os.path.isfile(os.path.join(directory, p)) for p in paths):
-                                self.add_path(directory, root)
+                                yield [self.get_path(directory, root)]
 
                     else:
-                        for filename in files:
-                            fullname = os.path.join(root, filename)
-                            if self.filters.validate(fullname):
-                                # Join the two strings in order to form the full filepath.
-                                self.add_path(directory, fullname)
+                        # Join the two strings in order to form the full filepath.
+                        yield [
+                            self.get_path(directory, fullname)
+                            for fullname in (os.path.join(root, filename) for filename in files)
+                            if self.filters.validate(fullname)
+                        ]
@@ -0,0 +1,170 @@
+import gzip
+import json
+import os
+from time import time_ns
+
+from dirutility.hash import Hash
+from dirutility.multiprocess import PoolProcess
+from dirutility.walk.scandir import scandir
+
+VERSION = 1
+
+# Directories modified this close to the time a snapshot was taken are always rescanned because coarse mtime
+# resolution could hide a later change within the same tick
+RACY_NS = 2 * 10 ** 9
+
+
+def _hash(file_path):
+    return Hash.from_file(file_path, 'md5')
+
+
+def _record(stat, previous=None):
+    """Return a [size, mtime_ns, inode, hash] file record, keeping the previous hash if the file is unchanged."""
+    record = [stat.st_size, stat.st_mtime_ns, stat.st_ino, None]
+    if previous and previous[:3] == record[:3]:
+        record[3] = previous[3]
+    return record
+
+
+class Snapshot:
+
+    def __init__(self, roots=None, taken=None):
+        """
+        Compact record of the directories and files within one or more root directories.
+
+        For every directory the snapshot stores its mtime_ns, the names of its sub directories and a
+        [size, mtime_ns, inode, hash] record for each file, which allows later scans to reuse the listing of any
+        directory whose mtime has not changed instead of scanning it again.
+
+        :param roots: Dictionary of root directory, {relative directory: [mtime_ns, subdirs, files]} pairs
+        :param taken: Time the snapshot was taken in nanoseconds
+        """
+        self.roots = roots or {}
+        self.taken = taken
+
+    def __len__(self):
+        return sum(len(d[2]) for dirs in self.roots.values() for d in dirs.values())
+
+    def __iter__(self):
+        return iter(self.files())
+
+    def files(self, full_paths=False):
+        """Generate the file paths within the snapshot."""
+        for root, dirs in self.roots.items():
+            for rel, (mtime_ns, subdirs, files) in dirs.items():
+                for name in files:
+                    path = os.path.join(rel, name)
+                    yield os.path.join(root, path) if full_paths else path
+
+    @classmethod
+    def take(cls, directories, hash_files=False):
+        """Take a new snapshot of a list of root directories."""
+        return cls().update(directories, hash_files=hash_files)[0]
+
+    @classmethod
+    def load(cls, file_path):
+        """Load a snapshot saved with the save method."""
+        with gzip.open(file_path, 'rt') as fp:
+            data = json.load(fp)
+        return cls(data['roots'], data['taken'])
+
+    def save(self, file_path):
+        """Save the snapshot to a gzip compressed JSON file."""
+        with gzip.open(file_path, 'wt') as fp:
+            json.dump({'version': VERSION, 'taken': self.taken, 'roots': self.roots}, fp, separators=(',', ':'))
+        return file_path
+
+    def _scan(self, root, verify_files):
+        """
+        Scan a root directory reusing the snapshot's listing of every directory whose mtime has not changed.
+
+        :return: Dictionary of relative directory, [mtime_ns, subdirs, files] pairs
+        """
+        previous = self.roots.get(root, {})
+        dirs = {}
+        stack = ['']
+        while stack:
+            rel = stack.pop()
+            path = os.path.join(root, rel)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            old = previous.get(rel)
+
+            if old and old[0] == mtime_ns and self.taken and mtime_ns < self.taken - RACY_NS:
+                # Directory listing is unchanged, only re-stat files when asked to verify them
+                subdirs, files = old[1], old[2]
+                if verify_files:
+                    files = {}
+                    for name, record in old[2].items():
+                        try:
+                            files[name] = _record(os.stat(os.path.join(path, name)), record)
+                        except OSError:
+                            pass
+            else:
+                entries, nondirs = scandir(path)
+                subdirs = [e.name for e in entries if not e.is_symlink()]
+                old_files = old[2] if old else {}
+                files = {}
+                for entry in nondirs:
+                    try:
+                        files[entry.name] = _record(entry.stat(), old_files.get(entry.name))
+                    except OSError:
+                        pass
+
+            dirs[rel] = [mtime_ns, subdirs, files]
+            stack.extend(os.path.join(rel, d) for d in subdirs)
+        return dirs
+
+    def update(self, directories, hash_files=False, verify_files=False):
+        """
+        Scan a list of root directories and return an updated snapshot along with the changes since this snapshot.
+
+        Only directories whose mtime has changed are listed again, every other directory costs a single stat.  A
+        directory's mtime changes when entries are added, removed or renamed within it but not when a file's contents
+        are modified in place, set verify_files to also stat every file in unchanged directories to catch those.
+
+        :param directories: List of root directories
+        :param hash_files: Bool, when true new or changed files are hashed
+        :param verify_files: Bool, when true files within unchanged directories are stat'd as well
+        :return: Tuple (Snapshot, dictionary of 'added', 'removed' and 'modified' sets of (root, relative path) tuples)
+        """
+        snapshot = Snapshot(taken=time_ns())
+        for root in directories:
+            snapshot.roots[root] = self._scan(root, verify_files)
+
+        if hash_files:
+            missing = [(files[name], os.path.join(root, rel, name))
+                       for root, dirs in snapshot.roots.items() for rel, (_, _, files) in dirs.items()
+                       for name, record in files.items() if record[3] is None]
+            if missing:
+                hashes = PoolProcess(_hash, [path for _, path in missing]).map_return()
+                for (record, _), _hash_value in zip(missing, hashes):
+                    record[3] = _hash_value
+        return snapshot, self.diff(snapshot)
+
+    def diff(self, other):
+        """
+        Return the changes between this snapshot and a newer one.
+
+        Files with a different size are modified, files with a different mtime or inode are modified unless both
+        snapshots hold matching hashes for them.  Directories whose listing was reused are skipped.
+
+        :return: Dictionary of 'added', 'removed' and 'modified' sets of (root, relative path) tuples
+        """
+        added, removed, modified = set(), set(), set()
+        for root in self.roots.keys() | other.roots.keys():
+            old_dirs, new_dirs = self.roots.get(root, {}), other.roots.get(root, {})
+            for rel in old_dirs.keys() | new_dirs.keys():
+                old = old_dirs[rel][2] if rel in old_dirs else {}
+                new = new_dirs[rel][2] if rel in new_dirs else {}
+                if old is new:
+                    continue
+                added.update((root, os.path.join(rel, name)) for name in new.keys() - old.keys())
+                removed.update((root, os.path.join(rel, name)) for name in old.keys() - new.keys())
+                for name in old.keys() & new.keys():
+                    a, b = old[name], new[name]
+                    if a[0] != b[0] or (a[1:3] != b[1:3] and not (a[3] and a[3] == b[3])):
+                        modified.add((root, os.path.join(rel, name)))
+        return {'added': added, 'removed': removed, 'modified': modified}
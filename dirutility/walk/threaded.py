@@ -0,0 +1,95 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from dirutility.walk.multiprocess import explore_path
+from dirutility.walk.result import file_batch
+from dirutility.walk.scandir import scandir
+
+
+class Relay:
+
+    def __init__(self, directory, filters, full_paths, pool_size, _printer, stat=False):
+        """DirPaths sub class for directory parsing using a pool of threads, suited to high latency filesystems."""
+        self.directory = directory
+        self.filters = filters
+        self.full_paths = full_paths
+        self.stat = stat
+        self.pool_size = pool_size
+        self._printer = _printer
+
+        if self.filters:
+            self._printer('Filtering enabled')
+        else:
+            self._printer('Filtering disabled')
+
+        self.filepaths = []
+        self.unsearched = deque()
+
+        if full_paths:
+            self._printer('Absolute paths')
+        else:
+            self._printer('Relative paths')
+
+    def __iter__(self):
+        return iter(self.filepaths)
+
+    def __len__(self):
+        return len(self.filepaths)
+
+    def _get_root_files(self, directory):
+        """Retrieve files within the root directory"""
+        # The root directory itself is gated like every other directory, as the walk & scandir engines do
+        if self.filters and not self.filters.validate(''):
+            return file_batch([], self.stat)
+        root_files = [(f.name, f) for f in scandir(directory)[1]]
+        if self.filters:
+            root_files = [(f, entry) for f, entry in root_files if self.filters.validate(f)]
+        if self.full_paths:
+            root_files = [(os.path.join(directory, f), entry) for f, entry in root_files]
+        return file_batch(root_files, self.stat)
+
+    def _explore(self, base, path):
+        self._printer("Thread >>> Explored path: " + path, stream=True)
+        return explore_path(base, path, self.filters, self.full_paths, self.stat)
+
+    def batches(self):
+        """
+        Generate lists of file paths as directories are explored.
+
+        Many directories are scanned concurrently so that the latency of each scandir call overlaps with others.
+        Batches are yielded in the order directories finish scanning, not in tree order.
+        """
+        self._printer('Threaded Walk')
+        for directory in self.directory:
+            root_files = self._get_root_files(directory)
+            if root_files:
+                yield root_files
+            for entry in scandir(directory)[0]:
+                if not entry.is_symlink():
+                    self.unsearched.append((directory, entry.name))
+
+        # Keep a bounded number of directories in flight, the rest wait in the unsearched deque
+        max_pending = self.pool_size * 4
+        with ThreadPoolExecutor(self.pool_size) as executor:
+            pending = set()
+            while self.unsearched or pending:
+                while self.unsearched and len(pending) < max_pending:
+                    pending.add(executor.submit(self._explore, *self.unsearched.popleft()))
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directories, files = future.result()
+                    self.unsearched.extend(directories)
+                    if files:
+                        yield files
+
+    def relay(self):
+        """
+        Called when parallelize is 'threads'.
+        This function will generate the file names in a directory tree using a thread pool to overlap many concurrent
+        scandir calls.  Significantly faster than crawler method on network filesystems (NFS, SMB, FUSE).
+        """
+        for files in self.batches():
+            self.filepaths.extend(files)
+        return self.filepaths
@@ -1,9 +1,9 @@
+import heapq
 import os
-import platform
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from functools import reduce
-from hashlib import md5
+from functools import reduce, partial
 from math import inf
 from multiprocessing import cpu_count
 from multiprocessing.pool import Pool
@@ -12,9 +12,21 @@ from pathlib import Path
 
 from looptools import Timer
 
+from dirutility.hash import Hash
+from dirutility.walk.cache import HashCache
 from dirutility.walk.filter import PathFilters
 from dirutility.walk.multiprocess import Sprinter
+from dirutility.walk.paths import CompactPaths
+from dirutility.walk.result import WalkResult, creation_time_ns, entry_stat
+from dirutility.walk.scandir import Scanner
 from dirutility.walk.sequential import Crawler
+from dirutility.walk.snapshot import Snapshot
+from dirutility.walk.threaded import Relay
+
+ENGINES = ('walk', 'scandir')
+
+# Number of paths stat'd per thread pool task when retrieving creation dates
+STAT_CHUNK = 1000
 
 
 class Printer:
@@ -51,9 +63,8 @@ def pool_process(func, iterable, process_name='Pool processing', cpus=cpu_count(
 
 
 def md5_hash(file_path):
-    """Open a file path and hash the contents."""
-    with open(file_path, 'rb') as fp:
-        return md5(fp.read()).hexdigest()
+    """Open a file path and hash the contents in chunks."""
+    return Hash.from_file(file_path, 'md5')
 
 
 def md5_tuple(file_path):
@@ -61,8 +72,27 @@ def md5_tuple(file_path):
     return file_path, md5_hash(file_path)
 
 
-def pool_hash(path_list):
-    """Pool process file hashing."""
+def cached_hash(path_list, map_func, cache):
+    """
+    Hash a list of file paths, only reading the files whose hashes are not found in a HashCache.
+
+    :param path_list: List of file paths
+    :param map_func: Function used to map md5_tuple onto the file paths missing from the cache
+    :param cache: HashCache object
+    :return: List of (file_path, hash) tuples
+    """
+    hashes, misses = cache.lookup(path_list)
+    keys = dict(misses)
+    hashed = map_func(md5_tuple, list(keys)) if keys else []
+    cache.store((path, keys[path], digest) for path, digest in hashed)
+    hashes.update(hashed)
+    return [(path, hashes[path]) for path in path_list]
+
+
+def pool_hash(path_list, cache=None):
+    """Pool process file hashing, skipping files with hashes in the cache if a HashCache is given."""
+    if cache is not None:
+        return cached_hash(path_list, partial(pool_process, process_name='MD5 hashing'), cache)
     return pool_process(md5_tuple, path_list, 'MD5 hashing')
 
 
@@ -91,16 +121,7 @@ def creation_date(path_to_file, return_datetime=True):
     :param return_datetime: Bool, returns value in Datetime format
     :return: Creation date
     """
-    if platform.system() == 'Windows':
-        created_at = os.path.getctime(path_to_file)
-    else:
-        stat = os.stat(path_to_file)
-        try:
-            created_at = stat.st_birthtime
-        except AttributeError:
-            # We're probably on Linux. No easy way to get creation dates here,
-            # so we'll settle for when its content was last modified.
-            created_at = stat.st_mtime
+    created_at = creation_time_ns(os.stat(path_to_file)) / 10 ** 9
 
     if return_datetime:
         return datetime.fromtimestamp(created_at)
@@ -113,9 +134,46 @@ def creation_date_tuple(file_path):
     return file_path, creation_date(file_path)
 
 
-def pool_creation_date(path_list):
-    """Pool process file creation dates."""
-    return pool_process(creation_date_tuple, path_list, 'File creation dates')
+def creation_date_chunk(path_list, roots=('',)):
+    """
+    Returns a list of (file_path, creation_date) tuples.
+
+    :param path_list: File paths, relative to one of roots
+    :param roots: Directories the file paths are joined with before stat'ing, tried in order
+    :return: Dates of every file found, files removed since they were walked are skipped
+    """
+    dates = []
+    for file_path in path_list:
+        for root in roots:
+            try:
+                stat = entry_stat(os.path.join(root, file_path))
+                break
+            except FileNotFoundError:
+                continue
+        else:
+            continue
+        dates.append((file_path, datetime.fromtimestamp(creation_time_ns(stat) / 10 ** 9)))
+    return dates
+
+
+def pool_creation_date(path_list, threads=32, roots=('',)):
+    """
+    Retrieve file creation dates using a pool of threads.
+
+    Retrieving a date costs a single stat call, which releases the GIL, so threads overlap stat calls without the
+    cost of starting processes and pickling every path.  Paths are submitted in chunks to limit per task overhead.
+    Relative file paths are resolved against roots, see creation_date_chunk.
+    """
+    path_list = list(path_list)
+    chunks = [path_list[i:i + STAT_CHUNK] for i in range(0, len(path_list), STAT_CHUNK)]
+    with ThreadPoolExecutor(threads) as executor:
+        chunk_dates = executor.map(partial(creation_date_chunk, roots=roots), chunks)
+        return [dates for chunk in chunk_dates for dates in chunk]
+
+
+def walk_result_dates(result):
+    """Returns a list of (file_path, creation_date) tuples from a WalkResult."""
+    return [(path, datetime.fromtimestamp(ns / 10 ** 9)) for path, ns in zip(result.paths, result.created_ns)]
 
 
 class DirPaths:
@@ -134,7 +192,10 @@ class DirPaths:
                  pool_size=cpu_count(),
                  console_output=False,
                  console_stream=False,
-                 hash_files=False):
+                 hash_files=False,
+                 engine='walk',
+                 hash_cache=None,
+                 patterns=None):
         """
         This class generates a list of either files and or folders within a root directory.
 
@@ -148,11 +209,15 @@ class DirPaths:
         :param to_exclude: None by default.  List of filters NOT acceptable to return
         :param min_level: 0 by default.  Minimum directory level to save paths from
         :param max_level: Infinity by default.  Maximum directory level to save paths from
-        :param parallelize: Bool, when true pool processing is enabled within walk method
-        :param pool_size: Number of CPUs for pool processing, default is number of processors
+        :param parallelize: Bool, when true pool processing is enabled within walk method.  Set to 'threads' to use a
+        thread pool instead, which overlaps directory scans on high latency (network) filesystems
+        :param pool_size: Number of CPUs (or threads) for pool processing, default is number of processors
         :param console_output: Bool, when true console output is printed
         :param console_stream: Bool, when true loops print live results
         :param hash_files: Bool, when true walk() method return a dictionary file_paths and hashes
+        :param engine: Sequential walk engine, 'walk' (os.walk) by default or 'scandir' (os.scandir DirEntry cache)
+        :param hash_cache: SQLite database path used to cache file hashes between runs when hash_files is enabled
+        :param patterns: None by default.  List (or newline separated string) of gitignore style patterns to exclude
         """
         self.timer = Timer()
         self.full_paths = full_paths
@@ -160,14 +225,20 @@ class DirPaths:
 
         # Exclude .DS_Store by default, set to_exclude to False to include .DS_Store
         to_exclude = ['.DS_Store'] if to_exclude is None else to_exclude
-        if any(i for i in [to_include, to_exclude, filters]) or min_level != 0 or max_level != inf:
-            self.filters = PathFilters(to_include, to_exclude, min_level, max_level, filters, non_empty_folders)
+        if any(i for i in [to_include, to_exclude, filters, patterns]) or min_level != 0 or max_level != inf:
+            self.filters = PathFilters(to_include, to_exclude, min_level, max_level, filters, non_empty_folders,
+                                       patterns)
         else:
             self.filters = False
 
         self.console_output = console_output
         self.console_stream = console_stream
         self._hash_files = hash_files
+        self._hash_cache = hash_cache
+
+        if engine not in ENGINES:
+            raise ValueError("engine must be one of {0}, not '{1}'".format(ENGINES, engine))
+        self.engine = engine
 
         self._printer = Printer(console_output, console_stream).printer
         self._printer('DIRPATHS')
@@ -185,7 +256,7 @@ class DirPaths:
             self.directory = [str(dirs) for dirs in directory]
 
     def __iter__(self):
-        return iter(list(self.filepaths))
+        return iter(self.filepaths)
 
     def __str__(self):
         return str(self.filepaths)
@@ -197,6 +268,11 @@ class DirPaths:
         """Filters list of file paths to remove non-included, remove excluded files and concatenate full paths."""
         self._printer(str(self.__len__()) + " file paths have been parsed in " + str(self.timer.end))
         if self._hash_files:
+            if self._hash_cache:
+                with HashCache(self._hash_cache) as cache:
+                    hashes = pool_hash(self.filepaths, cache)
+                    cache.evict(self.directory)
+                return hashes
             return pool_hash(self.filepaths)
         else:
             return self.filepaths
@@ -205,49 +281,181 @@ class DirPaths:
         """
         Return a list of (file_path, creation_date) tuples created from list of walked paths.
 
+        Dates are read from the columns of a stat walk, walk(stat=True), instead of stat'ing every path again.
+
         :param sort: Bool, sorts file_paths on created_date from newest to oldest.
         :return: List of (file_path, created_date) tuples.
         """
+        if isinstance(self.filepaths, WalkResult):
+            return walk_result_dates(self.filepaths.sort('created_ns', reverse=True) if sort else self.filepaths)
         if not sort:
-            return pool_creation_date(self.filepaths)
+            return pool_creation_date(self.filepaths, roots=self._roots())
         else:
-            pcd = pool_creation_date(self.filepaths)
+            pcd = pool_creation_date(self.filepaths, roots=self._roots())
             pcd.sort(key=itemgetter(1), reverse=True)
             return pcd
 
-    def walk(self):
+    def _roots(self):
+        """Return the directories walked paths are relative to."""
+        return ('',) if self.full_paths else tuple(self.directory)
+
+    def newest(self, n=100):
         """
-        Default file path retrieval function.
-        sprinter() - Generates file path list using pool processing and Queues
-        crawler() - Generates file path list using os.walk() in sequence
+        Return (file_path, creation_date) tuples for the n most recently created files, newest first.
+
+        A heap keeps only the n newest files rather than sorting every file.  Dates are read from the columns of a
+        stat walk when available, otherwise already walked paths are stat'd once.  When no paths have been walked yet
+        the tree is walked with stat=True.
+
+        :param n: Number of files to return
+        :return: List of (file_path, creation_date) tuples
+        """
+        if isinstance(self.filepaths, WalkResult):
+            return walk_result_dates(self.filepaths.newest(n))
+        elif self.filepaths:
+            return heapq.nlargest(n, pool_creation_date(self.filepaths, roots=self._roots()), key=itemgetter(1))
+        else:
+            self.walk(stat=True)
+            return walk_result_dates(self.filepaths.newest(n))
+
+    def _engine(self, stat=False):
+        """
+        Return the walk engine selected by the parallelize and engine parameters.
+        Relay - Generates file paths using a thread pool
+        Sprinter - Generates file paths using pool processing
+        Scanner - Generates file paths using os.scandir() in sequence
+        Crawler - Generates file paths using os.walk() in sequence
+
+        Crawler has no DirEntry objects to take stats from, so stat walks always use Scanner in sequence.
         """
-        if self.parallelize:
-            self.filepaths = Sprinter(self.directory, self.filters, self.full_paths, self.pool_size,
-                                      self._printer).sprinter()
+        if self.parallelize == 'threads':
+            return Relay(self.directory, self.filters, self.full_paths, self.pool_size, self._printer, stat)
+        elif self.parallelize:
+            return Sprinter(self.directory, self.filters, self.full_paths, self.pool_size, self._printer, stat)
+        elif self.engine == 'scandir' or stat:
+            return Scanner(self.directory, self.filters, self.full_paths, self.topdown, self._printer, stat)
         else:
-            self.filepaths = Crawler(self.directory, self.filters, self.full_paths, self.topdown,
-                                     self._printer).crawler()
+            return Crawler(self.directory, self.filters, self.full_paths, self.topdown, self._printer)
+
+    def walk(self, stat=False, compact=False):
+        """
+        Default file path retrieval function, returns a list of every walked file path.
+
+        :param stat: Bool, when true a WalkResult holding size, mtime_ns, mode and inode columns alongside the file
+        paths is returned instead of a list.  Stats are taken from the DirEntry objects produced by the walk.
+        :param compact: Bool, when true a CompactPaths container is returned instead of a list, which stores each
+        directory once and is far smaller for large trees
+        """
+        if stat and compact:
+            raise ValueError("stat and compact can't both be enabled")
+        if stat:
+            self.filepaths = WalkResult()
+        else:
+            self.filepaths = CompactPaths() if compact else []
+        for batch in self._engine(stat).batches():
+            self.filepaths.extend(batch)
         return self._get_filepaths()
 
+    def iter_walk(self, batch=False, chunk_size=1000):
+        """
+        Generate file paths as they are discovered instead of returning a list once the walk completes.
+
+        Paths are not stored on the DirPaths instance, so memory use stays constant regardless of tree size.  Parallel
+        engines yield paths in the order they are discovered, not in tree order.
+
+        :param batch: Bool, when true lists of paths are yielded instead of individual paths
+        :param chunk_size: Number of paths hashed at a time when hash_files is enabled
+        :return: Generator of file paths (or file path, hash tuples when hash_files is enabled)
+        """
+        batches = self._engine().batches()
+        if self._hash_files:
+            batches = self._hash_batches(batches, chunk_size)
+
+        for paths in batches:
+            if batch:
+                yield paths
+            else:
+                yield from paths
+
+    def _hash_batches(self, batches, chunk_size):
+        """Hash batches of file paths in chunks using a single pool of processes."""
+        cache = HashCache(self._hash_cache) if self._hash_cache else None
+        try:
+            with Pool(cpu_count()) as pool:
+                if cache is not None:
+                    hasher = partial(cached_hash, map_func=pool.map, cache=cache)
+                else:
+                    hasher = partial(pool.map, md5_tuple)
+
+                chunk = []
+                for paths in batches:
+                    chunk.extend(paths)
+                    if len(chunk) >= chunk_size:
+                        yield hasher(chunk)
+                        chunk = []
+                if chunk:
+                    yield hasher(chunk)
+
+            if cache is not None:
+                cache.evict(self.directory)
+        finally:
+            if cache is not None:
+                cache.close()
+
+    def snapshot(self, file_path=None):
+        """
+        Take a Snapshot of the file tree that can later be passed to changes().
+
+        :param file_path: Optional file path to save the snapshot to
+        :return: Snapshot object
+        """
+        snapshot = Snapshot.take(self.directory, hash_files=self._hash_files)
+        if file_path:
+            snapshot.save(file_path)
+        return snapshot
+
+    def changes(self, snapshot, verify_files=False, save=True):
+        """
+        Return the files that have been added, removed or modified since a snapshot was taken.
+
+        Only directories whose mtime changed since the snapshot are listed again.  Files modified in place within an
+        otherwise unchanged directory are only detected when verify_files is true.
+
+        :param snapshot: Snapshot object or file path of a saved snapshot
+        :param verify_files: Bool, when true files within unchanged directories are stat'd as well
+        :param save: Bool, when true and snapshot is a file path the updated snapshot is saved in its place
+        :return: Dictionary of 'added', 'removed' and 'modified' sets of file paths
+        """
+        previous = snapshot if isinstance(snapshot, Snapshot) else Snapshot.load(snapshot)
+        updated, delta = previous.update(self.directory, hash_files=self._hash_files, verify_files=verify_files)
+        if save and not isinstance(snapshot, Snapshot):
+            updated.save(snapshot)
+
+        changes = {}
+        for change, paths in delta.items():
+            changes[change] = {
+                os.path.join(root, path) if self.full_paths else path
+                for root, path in paths if not self.filters or self.filters.validate(path)
+            }
+        return changes
+
     def files(self):
         """Return list of files in root directory"""
         self._printer('\tFiles Walk')
         for directory in self.directory:
-            for path in os.listdir(directory):
-                full_path = os.path.join(directory, path)
-                if os.path.isfile(full_path):
-                    if not path.startswith('.'):
-                        self.filepaths.append(full_path)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and not entry.name.startswith('.'):
+                        self.filepaths.append(entry.path)
         return self._get_filepaths()
 
     def folders(self):
         """Return list of folders in root directory"""
         for directory in self.directory:
-            for path in os.listdir(directory):
-                full_path = os.path.join(directory, path)
-                if os.path.isdir(full_path):
-                    if not path.startswith('.'):
-                        self.filepaths.append(full_path)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir() and not entry.name.startswith('.'):
+                        self.filepaths.append(entry.path)
         return self._get_filepaths()
 
 
@@ -306,6 +514,25 @@ class DirTree:
                 parent[folders[-1]] = files
         return self.tree_dict
 
+    def paths(self, full_paths=False):
+        """
+        Return a CompactPaths container of the file paths within the tree.
+
+        :param full_paths: Bool, when true paths are joined to the root directory, otherwise they are relative to it
+        """
+        compact = CompactPaths()
+        stack = [('', branch) for branch in self.tree_dict.values()]
+        while stack:
+            path, branch = stack.pop()
+            for name, value in branch.items():
+                if isinstance(value, dict):
+                    stack.append((os.path.join(path, name), value))
+                elif full_paths:
+                    compact.add(os.path.join(str(self.directory), path, name))
+                else:
+                    compact.add(os.path.join(path, name))
+        return compact
+
 
 def gui():
     from dirutility.gui import WalkGUI
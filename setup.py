@@ -13,6 +13,7 @@ setup(name='dirutility',
       version=get_version(),
       packages=find_packages(),
       install_requires=['looptools>=1.2.3', 'tqdm'],
+      extras_require={'zst': ['zstandard']},
       entry_points={
           'console_scripts': [
               'zipbackup = dirutility.backup:main', 'dirpaths = dirutility.walk.walk:gui',
@@ -2,4 +2,29 @@ import os
 
 directory = os.path.join(os.path.dirname(__file__), 'games')
 
-__all__ = ['directory']
+
+def make_tree(root, depth=3, breadth=4, files=8, content=b''):
+    """
+    Create a synthetic directory tree for benchmarking.
+
+    :param root: Directory to create the tree within
+    :param depth: Number of directory levels below root
+    :param breadth: Number of sub directories within each directory
+    :param files: Number of files within each directory
+    :param content: Bytes written to each file
+    :return: Number of files created
+    """
+    count = 0
+    for i in range(files):
+        with open(os.path.join(root, 'file_{0}.txt'.format(i)), 'wb') as fp:
+            fp.write(content)
+        count += 1
+    if depth > 0:
+        for i in range(breadth):
+            sub = os.path.join(root, 'dir_{0}'.format(i))
+            os.mkdir(sub)
+            count += make_tree(sub, depth - 1, breadth, files, content)
+    return count
+
+
+__all__ = ['directory', 'make_tree']
@@ -0,0 +1,46 @@
+"""
+Compare sequential ZipBackup against parallel compression on a synthetic tree of compressible files.
+
+Parallel throughput scales with the number of cores, on a single core both modes perform about the same.  Adaptive
+compression is then compared against deflating every file on a tree of incompressible (media like) files.
+
+    $ python -m tests.benchmark_backup
+"""
+import os
+import random
+import tempfile
+from time import perf_counter
+
+from dirutility.backup import ZipBackup
+from tests import make_tree
+
+WORDS = [b'walk', b'scan', b'filter', b'hash', b'backup', b'archive', b'compress', b'directory']
+
+
+def main():
+    random.seed(0)
+    content = b' '.join(random.choice(WORDS) for _ in range(64 * 1024))
+    with tempfile.TemporaryDirectory() as temp:
+        source = os.path.join(temp, 'source')
+        os.mkdir(source)
+        files = make_tree(source, depth=2, breadth=4, files=10, content=content)
+        print('{0} files of {1} KB, {2} cpus\n'.format(files, len(content) // 1024, os.cpu_count()))
+        for label, kwargs in (('sequential', {}), ('parallel', {'parallelize': True})):
+            start = perf_counter()
+            zip_filename = ZipBackup(source, temp, compress_level=6, overwrite=True, **kwargs).backup()
+            print('{0:<12} {1:>8.3f}s {2:>10} bytes'.format(label, perf_counter() - start,
+                                                            os.path.getsize(zip_filename)))
+
+        media = os.path.join(temp, 'media')
+        os.mkdir(media)
+        files = make_tree(media, depth=2, breadth=4, files=10, content=os.urandom(len(content)))
+        print('\n{0} incompressible files of {1} KB\n'.format(files, len(content) // 1024))
+        for label, kwargs in (('deflate', {}), ('adaptive', {'adaptive': True})):
+            start = perf_counter()
+            zip_filename = ZipBackup(media, temp, compress_level=6, overwrite=True, **kwargs).backup()
+            print('{0:<12} {1:>8.3f}s {2:>10} bytes'.format(label, perf_counter() - start,
+                                                            os.path.getsize(zip_filename)))
+
+
+if __name__ == '__main__':
+    main()
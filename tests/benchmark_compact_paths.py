@@ -0,0 +1,49 @@
+"""
+Compare the memory used by a list of absolute path strings against CompactPaths for a deep synthetic tree.
+
+    $ python -m tests.benchmark_compact_paths
+"""
+import os
+import tracemalloc
+
+from dirutility.walk.paths import CompactPaths
+
+ROOT = os.path.join(os.sep, 'mnt', 'storage', 'projects', 'archive', 'dirutility')
+DEPTH = 6
+BREADTH = 6
+FILES = 20
+
+
+def generate_paths():
+    directories = [ROOT]
+    for _ in range(DEPTH):
+        directories = [os.path.join(d, 'directory_{0}'.format(i)) for d in directories for i in range(BREADTH)]
+    for d in directories:
+        for i in range(FILES):
+            yield os.path.join(d, 'file_{0}.json'.format(i))
+
+
+def measure(factory):
+    tracemalloc.start()
+    paths = factory(generate_paths())
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(paths), size
+
+
+def indexed(paths):
+    """Return a CompactPaths with the index membership tests build."""
+    compact = CompactPaths(paths)
+    compact._get_index()
+    return compact
+
+
+def main():
+    for label, factory in (('list', list), ('CompactPaths', CompactPaths), ('+ index', indexed)):
+        count, size = measure(factory)
+        print('{0:<14} {1:>9} paths {2:>10.1f} MB {3:>6.1f} bytes/path'.format(label, count, size / 1e6,
+                                                                               size / count))
+
+
+if __name__ == '__main__':
+    main()
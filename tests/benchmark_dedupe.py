@@ -0,0 +1,53 @@
+"""
+Compare find_duplicates against hashing every file with DirPaths(hash_files=True).
+
+The synthetic tree holds many files of the same size, most of which differ within their first few KB, plus a handful
+of true duplicates.
+
+    $ python -m tests.benchmark_dedupe
+"""
+import os
+import tempfile
+from collections import defaultdict
+from time import perf_counter
+
+from dirutility.dedupe import find_duplicates
+from dirutility.walk import DirPaths
+
+FILES = 500
+SIZE = 256 * 1024
+DUPLICATES = 10
+
+
+def make_files(root):
+    body = os.urandom(SIZE)
+    for i in range(FILES):
+        with open(os.path.join(root, 'file_{0}.bin'.format(i)), 'wb') as fp:
+            # Files share a size and most of their content but start with a unique header
+            fp.write(os.urandom(16) + body[16:])
+    for i in range(DUPLICATES):
+        with open(os.path.join(root, 'file_{0}.bin'.format(i)), 'rb') as src:
+            with open(os.path.join(root, 'copy_{0}.bin'.format(i)), 'wb') as dst:
+                dst.write(src.read())
+
+
+def hash_everything(root):
+    groups = defaultdict(list)
+    for path, _hash in DirPaths(root, full_paths=True, hash_files=True).walk():
+        groups[_hash].append(path)
+    return sorted(sorted(paths) for paths in groups.values() if len(paths) > 1)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        make_files(root)
+        print('Synthetic tree: {0} files of {1} KB, {2} duplicates\n'.format(FILES + DUPLICATES, SIZE // 1024,
+                                                                             DUPLICATES))
+        for label, func in (('DirPaths(hash_files=True)', hash_everything), ('find_duplicates', find_duplicates)):
+            start = perf_counter()
+            groups = func(root)
+            print('{0:<28} {1:>4} groups {2:>8.3f}s'.format(label, len(groups), perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Measure the per-path cost of PathFilters.validate with 500 exclusion patterns.
+
+The compiled filters are compared against the previous implementation, which lowercased the path and every pattern
+on every call.  The gitignore style pattern backend is then compared against substring filters excluding the same
+files during a walk of a synthetic tree.
+
+    $ python -m tests.benchmark_filters
+"""
+import os
+import random
+import string
+import tempfile
+from timeit import timeit
+
+from dirutility.walk import DirPaths
+from dirutility.walk.filter import PathFilters
+from tests import make_tree
+
+PATTERNS = 500
+PATHS = 2000
+
+
+def legacy_validate(path, to_exclude):
+    """PathFilters.validate exclusion handling prior to compiled patterns."""
+    if any(str(ex).lower() in path.lower() for ex in to_exclude):
+        return False
+    return True
+
+
+def random_name(length):
+    return ''.join(random.choice(string.ascii_letters + string.digits + '_-') for _ in range(length))
+
+
+def main():
+    random.seed(0)
+    to_exclude = [random_name(random.randint(4, 12)) for _ in range(PATTERNS)]
+    paths = [os.sep.join(random_name(random.randint(4, 16)) for _ in range(random.randint(2, 6))) for _ in range(PATHS)]
+    filters = PathFilters(to_exclude=to_exclude, max_level=float('inf'))
+
+    assert [filters.validate(p) for p in paths] == [legacy_validate(p, to_exclude) for p in paths]
+
+    legacy = timeit(lambda: [legacy_validate(p, to_exclude) for p in paths], number=3) / (3 * PATHS)
+    compiled = timeit(lambda: [filters.validate(p) for p in paths], number=3) / (3 * PATHS)
+    print('{0} exclusion patterns, {1} paths\n'.format(PATTERNS, PATHS))
+    print('{0:<12} {1:>8.2f} us/path'.format('legacy', legacy * 1e6))
+    print('{0:<12} {1:>8.2f} us/path ({2:.0f}x)'.format('compiled', compiled * 1e6, legacy / compiled))
+
+    with tempfile.TemporaryDirectory() as root:
+        files = make_tree(root, depth=4, breadth=5, files=20)
+        substring = {'to_exclude': ['file_1', 'dir_0']}
+        patterns = {'patterns': ['file_1*', 'dir_0/']}
+        assert sorted(DirPaths(root, **substring).walk()) == sorted(DirPaths(root, **patterns).walk())
+
+        print('\nWalk of {0} files excluding a directory name & a file prefix\n'.format(files))
+        for label, kwargs in (('substring', substring), ('patterns', patterns)):
+            elapsed = timeit(lambda: DirPaths(root, engine='scandir', **kwargs).walk(), number=3) / 3
+            print('{0:<12} {1:>8.3f}s'.format(label, elapsed))
+
+
+if __name__ == '__main__':
+    main()
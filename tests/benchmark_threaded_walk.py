@@ -0,0 +1,54 @@
+"""
+Show how the threaded walk engine hides per-directory latency.
+
+A delayed filesystem is simulated by patching os.scandir so every directory listing sleeps before returning, standing
+in for the round trip of an NFS, SMB or FUSE mount.
+
+    $ python -m tests.benchmark_threaded_walk
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from time import perf_counter, sleep
+
+from dirutility.walk import DirPaths
+from tests import make_tree
+
+LATENCY = 0.005
+
+
+@contextmanager
+def delayed_scandir(latency=LATENCY):
+    """Patch os.scandir so that every call waits for latency seconds."""
+    original = os.scandir
+
+    def scandir(*args, **kwargs):
+        sleep(latency)
+        return original(*args, **kwargs)
+
+    os.scandir = scandir
+    try:
+        yield
+    finally:
+        os.scandir = original
+
+
+def run(label, root, **kwargs):
+    with delayed_scandir():
+        start = perf_counter()
+        paths = DirPaths(root, to_exclude=False, **kwargs).walk()
+        elapsed = perf_counter() - start
+    print('{0:<28} {1:>7} files {2:>8.3f}s'.format(label, len(paths), elapsed))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        files = make_tree(root, depth=3, breadth=6, files=10)
+        print('Synthetic tree: {0} files, {1}ms latency per directory\n'.format(files, LATENCY * 1000))
+        run('Scanner (sequential)', root, engine='scandir')
+        for pool_size in (4, 16, 64):
+            run('Relay pool_size={0}'.format(pool_size), root, parallelize='threads', pool_size=pool_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Compare the filesystem calls made by the DirPaths walk engines.
+
+Every call to os.stat, os.lstat, os.listdir and os.scandir made from Python is counted (genericpath's isdir/isfile go
+through os.stat).  Each counted call is at least one syscall; DirEntry classification via the cached d_type adds none.
+
+    $ python -m tests.benchmark_walk_engines
+"""
+import os
+import tempfile
+from collections import Counter
+from contextlib import contextmanager
+from time import perf_counter
+
+from dirutility.walk import DirPaths
+from tests import make_tree
+
+CALLS = ('stat', 'lstat', 'listdir', 'scandir')
+
+
+@contextmanager
+def count_calls():
+    """Patch the os module so that filesystem calls are counted."""
+    counts = Counter()
+    originals = {name: getattr(os, name) for name in CALLS}
+
+    def counted(name, func):
+
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    for name, func in originals.items():
+        setattr(os, name, counted(name, func))
+    try:
+        yield counts
+    finally:
+        for name, func in originals.items():
+            setattr(os, name, func)
+
+
+def run(label, root, **kwargs):
+    with count_calls() as counts:
+        start = perf_counter()
+        paths = DirPaths(root, **kwargs).walk()
+        elapsed = perf_counter() - start
+    print('{0:<32} {1:>7} files {2:>8.3f}s  {3}'.format(label, len(paths), elapsed,
+                                                        ', '.join('{0}={1}'.format(c, counts[c]) for c in CALLS)))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        files = make_tree(root, depth=4, breadth=5, files=20)
+        print('Synthetic tree: {0} files\n'.format(files))
+        run('Crawler (os.walk)', root)
+        run('Crawler non_empty_folders', root, max_level=3, non_empty_folders=True)
+        run('Scanner (os.scandir)', root, engine='scandir')
+        run('Scanner non_empty_folders', root, max_level=3, non_empty_folders=True, engine='scandir')
+        run('Crawler max_level=2', root, max_level=2)
+        run('Scanner max_level=2', root, max_level=2, engine='scandir')
+        run('Scanner to_exclude=dir_0', root, to_exclude=['dir_0'], engine='scandir')
+        for pool_size in (1, 2, 4, 8):
+            run('Sprinter pool_size={0} (parent)'.format(pool_size), root, parallelize=True, pool_size=pool_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Compare ZipFile.create_archive against the previous os.walk & PyZipFile implementation on 100k small files.
+
+    $ python -m tests.benchmark_zip_archive
+"""
+import os
+import tempfile
+import zipfile
+from time import perf_counter
+
+from dirutility.open.clazz import TempDir, ZipFile
+from tests import make_tree
+
+
+def legacy_create_archive(filepath, dirpath):
+    """ZipFile.create_archive prior to the single pass scandir writer."""
+    zip_file = zipfile.PyZipFile(filepath, mode='w')
+    for root, dirs, files in os.walk(dirpath):
+        if files:
+            for file in files:
+                _fp = os.path.join(root, file)
+                zip_file.write(_fp, arcname=_fp.replace(dirpath, ''))
+        else:
+            zip_file.write(root, arcname=root.replace(dirpath, ''))
+    zip_file.close()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp:
+        source = os.path.join(temp, 'source')
+        os.mkdir(source)
+        files = make_tree(source, depth=3, breadth=10, files=90, content=b'small file contents\n' * 10)
+        print('{0} files of 200 bytes\n'.format(files))
+
+        archive = os.path.join(temp, 'legacy.zip')
+        start = perf_counter()
+        legacy_create_archive(archive, source)
+        print('{0:<10} {1:>8.3f}s'.format('legacy', perf_counter() - start))
+
+        archive = os.path.join(temp, 'scandir.zip')
+        start = perf_counter()
+        ZipFile(archive, TempDir(source)).create_archive()
+        print('{0:<10} {1:>8.3f}s'.format('scandir', perf_counter() - start))
+
+        with zipfile.ZipFile(archive) as zf:
+            assert len([i for i in zf.infolist() if not i.is_dir()]) == files
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,17 @@
+import io
 import os
 import shutil
+import tarfile
+import tempfile
 import unittest
+import zipfile
 from time import sleep
+from unittest import mock
 
+from dirutility.open import clazz
+from dirutility.open.clazz import TempDir, ZipFile
 from dirutility.open.open import tardir
+from tests import directory
 
 
 destination = os.path.join(os.path.dirname(__file__), 'data')
@@ -55,5 +63,99 @@ class TestArchive(unittest.TestCase):
         os.remove(tempfile)
 
 
+class TestArchiveInMemory(unittest.TestCase):
+
+    @staticmethod
+    def paths():
+        return {
+            'abc': 'abc abc abc',
+            'empty': None,
+            'kbs': {
+                'haha': {},
+                'yoyo': {
+                    'haha': io.StringIO('line 1\nline 2\n')
+                }
+            },
+        }
+
+    def tar_contents(self, path):
+        with tarfile.open(path) as tar:
+            return {m.name: (m.type, tar.extractfile(m).read() if m.isfile() else None) for m in tar.getmembers()}
+
+    def test_tar(self):
+        with tempfile.TemporaryDirectory() as temp:
+            with tardir(os.path.join(temp, 'disk.tar.gz'), **self.paths()) as disk:
+                expected = self.tar_contents(disk.filepath)
+            with mock.patch('dirutility.open.open.tempdir') as temp_dir, \
+                    tardir(os.path.join(temp, 'memory.tar.gz'), inmemory=True, **self.paths()) as memory:
+                temp_dir.assert_not_called()
+                self.assertEqual(self.tar_contents(memory.filepath), expected)
+                self.assertEqual(expected['kbs/yoyo/haha'], (tarfile.REGTYPE, b'line 1\nline 2\n'))
+
+    def test_zip(self):
+        with tempfile.TemporaryDirectory() as temp:
+            with tardir(os.path.join(temp, 'memory.zip'), mode='w:zip', withdir=True, inmemory=True,
+                        bin=b'\x00\x01', **self.paths()) as memory:
+                with zipfile.ZipFile(memory.filepath) as zf:
+                    self.assertIsNone(zf.testzip())
+                    self.assertEqual(zf.read('memory/abc'), b'abc abc abc')
+                    self.assertEqual(zf.read('memory/bin'), b'\x00\x01')
+                    self.assertTrue(zf.getinfo('memory/kbs/haha/').is_dir())
+                    self.assertEqual(zf.read('memory/kbs/yoyo/haha'), b'line 1\nline 2\n')
+
+
+class TestZipFile(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.source = os.path.join(self.temp, 'games')
+        shutil.copytree(directory, self.source)
+        os.makedirs(os.path.join(self.source, 'empty', 'nested'))
+        self.expected = {}
+        for root, dirs, files in os.walk(self.source):
+            for f in files:
+                with open(os.path.join(root, f), 'rb') as fp:
+                    self.expected[os.path.relpath(os.path.join(root, f), self.source).replace(os.sep, '/')] = fp.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def create(self, withdir=False, compress_level=None):
+        archive = os.path.join(self.temp, 'games.zip')
+        ZipFile(archive, TempDir(self.source), compress_level=compress_level).create_archive(withdir=withdir)
+        with zipfile.ZipFile(archive) as zf:
+            self.assertIsNone(zf.testzip())
+            return {i.filename: (i.compress_type, i.is_dir() or zf.read(i)) for i in zf.infolist()}
+
+    def test_create_archive(self):
+        members = self.create()
+        self.assertEqual(members.pop('empty/nested/'), (zipfile.ZIP_STORED, True))
+        self.assertEqual({name: data for name, (compress_type, data) in members.items()}, self.expected)
+        self.assertEqual({compress_type for compress_type, data in members.values()}, {zipfile.ZIP_STORED})
+
+    def test_create_archive_withdir(self):
+        members = self.create(withdir=True, compress_level=6)
+        self.assertIn('games/empty/nested/', members)
+        for name, data in self.expected.items():
+            self.assertEqual(members['games/' + name], (zipfile.ZIP_DEFLATED, data))
+
+    def test_create_archive_large_files(self):
+        with mock.patch.object(clazz, 'ZIP_BUFFER_SIZE', 1024):
+            members = self.create(compress_level=6)
+        members.pop('empty/nested/')
+        self.assertEqual({name: data for name, (compress_type, data) in members.items()}, self.expected)
+
+    def test_create_archive_symlinks(self):
+        name = next(iter(self.expected))
+        os.symlink(os.path.join(self.source, 'empty'), os.path.join(self.source, 'linked_dir'))
+        os.symlink(os.path.join(self.source, *name.split('/')), os.path.join(self.source, 'linked_file'))
+        os.symlink(os.path.join(self.temp, 'missing'), os.path.join(self.source, 'dangling'))
+        os.mkfifo(os.path.join(self.source, 'fifo'))
+        members = self.create(compress_level=6)
+        members.pop('empty/nested/')
+        self.assertEqual(members.pop('linked_file'), (zipfile.ZIP_DEFLATED, self.expected[name]))
+        self.assertEqual({name: data for name, (compress_type, data) in members.items()}, self.expected)
+
+
 if __name__ == '__main__':
     unittest.main()
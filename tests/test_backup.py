@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
+
+from dirutility import backup
+from dirutility.backup import ZipBackup, MANIFEST, read_manifest, restore, choose_compression
+from tests import directory
+
+
+class TestZipBackup(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.source = os.path.join(self.temp, 'games')
+        shutil.copytree(directory, self.source)
+        self.destination = os.path.join(self.temp, 'backups')
+        os.mkdir(self.destination)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def contents(self, zip_filename):
+        with ZipFile(zip_filename) as zf:
+            self.assertIsNone(zf.testzip())
+            return {i.filename: (i.compress_type, zf.read(i)) for i in zf.infolist()}
+
+    def test_compression(self):
+        for level, compression in ((0, ZIP_STORED), (6, ZIP_DEFLATED)):
+            members = self.contents(ZipBackup(self.source, self.destination, compress_level=level).backup())
+            self.assertTrue(members)
+            self.assertEqual({c for c, data in members.values()}, {compression})
+
+    def test_parallel(self):
+        for level in (0, 6):
+            expected = self.contents(ZipBackup(self.source, self.destination, compress_level=level).backup())
+            parallel = ZipBackup(self.source, self.destination, compress_level=level, parallelize=True, pool_size=4)
+            self.assertEqual(self.contents(parallel.backup()), expected)
+
+    def test_parallel_large_files(self):
+        expected = self.contents(ZipBackup(self.source, self.destination, compress_level=6).backup())
+        with mock.patch.object(backup, 'LARGE_FILE', 1024):
+            parallel = ZipBackup(self.source, self.destination, compress_level=6, parallelize=True, pool_size=4)
+            self.assertEqual(self.contents(parallel.backup()), expected)
+
+    def test_adaptive(self):
+        with open(os.path.join(self.source, 'noise.bin'), 'wb') as fp:
+            fp.write(os.urandom(100000))
+        with open(os.path.join(self.source, 'photo.JPG'), 'wb') as fp:
+            fp.write(b'a' * 100000)
+        self.assertEqual(choose_compression(os.path.join(self.source, 'noise.bin')), (ZIP_STORED, 'stored_sample'))
+
+        for parallelize in (False, True):
+            zip_backup = ZipBackup(self.source, self.destination, compress_level=6, adaptive=True,
+                                   parallelize=parallelize)
+            members = self.contents(zip_backup.backup())
+            self.assertEqual(members['noise.bin'][0], ZIP_STORED)
+            self.assertEqual(members['photo.JPG'], (ZIP_STORED, b'a' * 100000))
+            self.assertEqual(zip_backup.stats, {'deflated': len(members) - 2, 'stored': 2, 'stored_extension': 1,
+                                                'stored_sample': 1})
+
+    def test_stream(self):
+        expected = self.contents(ZipBackup(self.source, self.destination, compress_level=6).backup())
+        for parallelize in (False, True):
+            zip_backup = ZipBackup(self.source, self.destination, compress_level=6, stream=True,
+                                   parallelize=parallelize)
+            with mock.patch.object(backup.PathStream, '_walk', autospec=True,
+                                   side_effect=backup.PathStream._walk) as walk:
+                self.assertEqual(self.contents(zip_backup.backup()), expected)
+                walk.assert_called_once()
+
+    def test_stream_error(self):
+        stream = backup.PathStream(os.path.join(self.temp, 'missing'))
+        self.assertEqual(list(stream), [])
+        with mock.patch.object(backup, 'DirPaths', side_effect=OSError('walk failed')):
+            self.assertRaises(OSError, list, backup.PathStream(self.source))
+
+    def restored(self, zip_filename):
+        destination = tempfile.mkdtemp(dir=self.temp)
+        restore(zip_filename, destination)
+        return {os.path.relpath(os.path.join(root, f), destination): Path(root, f).read_bytes()
+                for root, dirs, files in os.walk(destination) for f in files}
+
+    def test_incremental(self):
+        expected = self.restored(ZipBackup(self.source, self.destination).backup())
+        first = ZipBackup(self.source, self.destination, incremental=True).backup()
+        self.assertEqual(self.restored(first), expected)
+        self.assertIsNone(read_manifest(first)['previous'])
+
+        # Modify, add & remove files
+        names = sorted(expected)
+        with open(os.path.join(self.source, names[0]), 'ab') as fp:
+            fp.write(b'changed')
+        with open(os.path.join(self.source, 'added.txt'), 'wb') as fp:
+            fp.write(b'added')
+        os.remove(os.path.join(self.source, names[1]))
+        expected[names[0]] += b'changed'
+        expected['added.txt'] = b'added'
+        del expected[names[1]]
+
+        second = ZipBackup(self.source, self.destination, incremental=True, parallelize=True).backup()
+        with ZipFile(second) as zf:
+            self.assertEqual(sorted(zf.namelist()), sorted([MANIFEST, 'added.txt', names[0].replace(os.sep, '/')]))
+        self.assertEqual(read_manifest(second)['previous'], os.path.basename(first))
+        self.assertEqual(self.restored(second), expected)
+
+        # Unchanged source only writes a manifest
+        third = ZipBackup(self.source, self.destination, incremental=True).backup()
+        with ZipFile(third) as zf:
+            self.assertEqual(zf.namelist(), [MANIFEST])
+        self.assertEqual(self.restored(third), expected)
+
+    def test_incremental_overwrite(self):
+        self.assertRaises(ValueError, ZipBackup, self.source, self.destination, incremental=True, overwrite=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
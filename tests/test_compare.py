@@ -0,0 +1,66 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from dirutility.compare import compare_trees
+from tests import directory
+
+
+class TestCompareTrees(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.dir1 = os.path.join(self.temp, 'dir1')
+        self.dir2 = os.path.join(self.temp, 'dir2')
+        shutil.copytree(directory, self.dir1)
+        shutil.copytree(directory, self.dir2)
+        self.paths = sorted(os.path.relpath(os.path.join(root, f), self.dir1)
+                            for root, _, files in os.walk(self.dir1) for f in files)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_compare_paths(self):
+        os.remove(os.path.join(self.dir1, self.paths[0]))
+        self.assertEqual(compare_trees(self.dir1, self.dir2), ([], [self.paths[0]]))
+
+    def test_compare_content(self):
+        removed, added, modified, touched = self.paths[:4]
+        os.remove(os.path.join(self.dir2, removed))
+        shutil.move(os.path.join(self.dir1, added), os.path.join(self.dir1, added + '.tmp'))
+        # Same size and different content
+        with open(os.path.join(self.dir2, modified), 'r+b') as fp:
+            first = fp.read(1)
+            fp.seek(0)
+            fp.write(b'x' if first != b'x' else b'y')
+        # Same content with a different modification time
+        os.utime(os.path.join(self.dir2, touched), ns=(0, 0))
+
+        result = compare_trees(self.dir1, self.dir2, mode='content')
+        self.assertEqual(result['added'], {added})
+        self.assertEqual(result['removed'], {removed, added + '.tmp'})
+        self.assertEqual(result['modified'], {modified})
+        self.assertIn(touched, result['unchanged'])
+        self.assertEqual(len(result['unchanged']), len(self.paths) - 3)
+
+    def test_compare_content_without_xxhash(self):
+        with open(os.path.join(self.dir2, self.paths[0]), 'ab') as fp:
+            fp.write(b' ')
+        os.utime(os.path.join(self.dir2, self.paths[1]), ns=(0, 0))
+        # xxhash is optional, the default algorithm is picked at import time so check it in a fresh interpreter
+        script = ("import sys; sys.modules['xxhash'] = None; from dirutility.compare import compare_contents; "
+                  "result = compare_contents(sys.argv[1], sys.argv[2]); print(len(result['unchanged']))")
+        output = subprocess.check_output([sys.executable, '-c', script, self.dir1, self.dir2],
+                                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(int(output), len(self.paths) - 1)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            compare_trees(self.dir1, self.dir2, mode='size')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from dirutility.dedupe import find_duplicates, partial_hash, SAMPLE_SIZE
+
+
+class TestFindDuplicates(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.root = tempfile.mkdtemp()
+        os.mkdir(os.path.join(cls.root, 'sub'))
+        block = os.urandom(SAMPLE_SIZE * 3)
+        files = {
+            'a.bin': block,
+            'sub/a_copy.bin': block,
+            # Same size, start and end as a.bin but different in the middle
+            'middle.bin': block[:SAMPLE_SIZE] + bytes(SAMPLE_SIZE) + block[-SAMPLE_SIZE:],
+            # Same size as a.bin with different contents
+            'other.bin': os.urandom(SAMPLE_SIZE * 3),
+            'small.txt': b'small',
+            'sub/small_copy.txt': b'small',
+            'empty.txt': b'',
+            'sub/empty_copy.txt': b'',
+        }
+        for name, content in files.items():
+            with open(os.path.join(cls.root, name), 'wb') as fp:
+                fp.write(content)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.root)
+
+    def test_find_duplicates(self):
+        duplicates = find_duplicates(self.root, cpus=2)
+        expected = [
+            [os.path.join(self.root, 'a.bin'), os.path.join(self.root, 'sub', 'a_copy.bin')],
+            [os.path.join(self.root, 'small.txt'), os.path.join(self.root, 'sub', 'small_copy.txt')],
+        ]
+        self.assertEqual(duplicates, expected)
+
+    def test_find_duplicates_empty_files(self):
+        duplicates = find_duplicates(self.root, min_size=0, cpus=2)
+        self.assertIn([os.path.join(self.root, 'empty.txt'), os.path.join(self.root, 'sub', 'empty_copy.txt')],
+                      duplicates)
+
+    def test_partial_hash_collision(self):
+        _, a = partial_hash(os.path.join(self.root, 'a.bin'))
+        _, middle = partial_hash(os.path.join(self.root, 'middle.bin'))
+        self.assertEqual(a, middle)
+
+    def test_partial_hash_without_xxhash(self):
+        # xxhash is optional, the default algorithm is picked at import time so check it in a fresh interpreter
+        script = ("import sys; sys.modules['xxhash'] = None; "
+                  "from dirutility.dedupe import partial_hash; print(partial_hash(sys.argv[1])[1])")
+        digest = subprocess.check_output([sys.executable, '-c', script, os.path.join(self.root, 'a.bin')],
+                                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(len(digest.strip()), 128)
+
+
+if __name__ == '__main__':
+    unittest.main()
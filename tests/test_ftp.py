@@ -0,0 +1,122 @@
+import errno
+import ftplib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from dirutility.ftp import FTPPool
+from tests import directory
+
+try:
+    from pyftpdlib.authorizers import DummyAuthorizer
+    from pyftpdlib.handlers import FTPHandler
+    from pyftpdlib.log import config_logging
+    from pyftpdlib.servers import ThreadedFTPServer
+except ImportError:
+    ThreadedFTPServer = None
+
+
+@unittest.skipIf(ThreadedFTPServer is None, 'pyftpdlib is not installed')
+class TestFTPPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        config_logging(level=logging.WARNING)
+        cls.root = tempfile.mkdtemp()
+        authorizer = DummyAuthorizer()
+        authorizer.add_user('user', 'password', cls.root, perm='elradfmw')
+        handler = type('Handler', (FTPHandler,), {'authorizer': authorizer})
+        cls.server = ThreadedFTPServer(('127.0.0.1', 0), handler)
+        cls.port = cls.server.address[1]
+        cls.thread = threading.Thread(target=cls.server.serve_forever, kwargs={'timeout': 0.1}, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close_all()
+        cls.thread.join()
+        shutil.rmtree(cls.root)
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.pool = FTPPool('127.0.0.1', 'user', 'password', self.port, size=4, retry_delay=0)
+
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.temp)
+        shutil.rmtree(self.root)
+        os.mkdir(self.root)
+
+    @staticmethod
+    def files(root):
+        return {os.path.relpath(os.path.join(path, f), root): Path(path, f).read_bytes()
+                for path, dirs, files in os.walk(root) for f in files}
+
+    def test_put_get(self):
+        cwd = os.getcwd()
+        local = os.path.join(directory, '2018-11-01', '2018020180.json')
+        self.assertTrue(self.pool.put(local, 'a/b/2018020180.json').startswith('226'))
+        self.assertEqual(Path(self.root, 'a', 'b', '2018020180.json').read_bytes(), Path(local).read_bytes())
+
+        downloaded = os.path.join(self.temp, 'c', '2018020180.json')
+        self.assertTrue(self.pool.get('a/b/2018020180.json', downloaded).startswith('226'))
+        self.assertEqual(Path(downloaded).read_bytes(), Path(local).read_bytes())
+        self.assertEqual(os.getcwd(), cwd)
+
+    def test_put_tree(self):
+        responses = self.pool.put_tree(directory, 'games')
+        expected = self.files(directory)
+        self.assertEqual(len(responses), len(expected))
+        self.assertEqual(self.files(os.path.join(self.root, 'games')), expected)
+        self.assertLessEqual(self.pool._idle.qsize(), 4)
+
+        transfers = [('games/' + name.replace(os.sep, '/'), os.path.join(self.temp, name)) for name in expected]
+        self.pool.get_many(transfers)
+        self.assertEqual(self.files(self.temp), expected)
+
+    def test_retry(self):
+        local = os.path.join(directory, '2018-11-01', '2018020180.json')
+        storbinary = ftplib.FTP.storbinary
+        errors = [ftplib.error_temp('421 try again'), ConnectionResetError()]
+
+        def flaky(session, *args):
+            if errors:
+                raise errors.pop()
+            return storbinary(session, *args)
+
+        with mock.patch.object(ftplib.FTP, 'storbinary', autospec=True, side_effect=flaky) as stor:
+            self.pool.put(local, '2018020180.json')
+            self.assertEqual(stor.call_count, 3)
+        self.assertEqual(Path(self.root, '2018020180.json').read_bytes(), Path(local).read_bytes())
+
+        with mock.patch.object(ftplib.FTP, 'storbinary', side_effect=ftplib.error_temp('421 try again')) as stor:
+            self.assertRaises(ftplib.error_temp, self.pool.put, local, '2018020180.json')
+            self.assertEqual(stor.call_count, 4)
+
+    def test_local_error(self):
+        local = os.path.join(directory, '2018-11-01', '2018020180.json')
+        with mock.patch.object(ftplib.FTP, 'storbinary', side_effect=OSError(errno.EIO, 'I/O error')) as stor:
+            self.assertRaises(OSError, self.pool.put, local, '2018020180.json')
+            stor.assert_called_once()
+        self.assertTrue(self.pool.put(local, '2018020180.json').startswith('226'))
+
+    def test_permanent_error(self):
+        missing = os.path.join(self.temp, 'missing.txt')
+        with mock.patch.object(ftplib.FTP, 'retrbinary', side_effect=ftplib.error_perm('550')) as retr:
+            self.assertRaises(ftplib.error_perm, self.pool.get, 'missing.txt', missing)
+            retr.assert_called_once()
+        self.assertFalse(os.path.exists(missing))
+        self.assertEqual(self.pool._idle.qsize(), 1)
+        self.assertRaises(ftplib.error_perm, self.pool.get, 'missing.txt', missing)
+
+    def test_size(self):
+        self.assertRaises(ValueError, FTPPool, '127.0.0.1', 'user', 'password', self.port, size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -111,6 +111,46 @@ class TestHashFile(unittest.TestCase):
         self.hash.xxh64()
 
 
+class TestHashFromFile(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(FILE, 'rb') as fp:
+            cls.hash = Hash(fp.read())
+
+    def test_algorithms(self):
+        for algo in ('md5', 'sha1', 'sha256', 'sha512', 'blake2b', 'blake2s', 'shake_128', 'xxh32', 'xxh64'):
+            self.assertEqual(Hash.from_file(FILE, algo), getattr(self.hash, algo)())
+
+    def test_chunk_size(self):
+        self.assertEqual(Hash.from_file(FILE, 'sha256', chunk_size=1000), self.hash.sha256())
+
+    def test_invalid_algo(self):
+        with self.assertRaises(ValueError):
+            Hash.from_file(FILE, 'md4')
+
+
+class TestHashMulti(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(FILE, 'rb') as fp:
+            cls.data = fp.read()
+        cls.hash = Hash(cls.data)
+        cls.algos = ['md5', 'sha256', 'xxh64', 'shake_128']
+        cls.expected = {algo: getattr(cls.hash, algo)() for algo in cls.algos}
+
+    def test_file_path(self):
+        self.assertEqual(Hash.multi(FILE, self.algos, chunk_size=4096), self.expected)
+
+    def test_buffer(self):
+        self.assertEqual(Hash.multi(self.data, self.algos), self.expected)
+
+    def test_file_object(self):
+        with open(FILE, 'rb') as fp:
+            self.assertEqual(Hash.multi(fp, self.algos, chunk_size=4096), self.expected)
+
+
 class TestHashString(unittest.TestCase):
 
     @classmethod
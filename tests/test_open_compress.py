@@ -0,0 +1,76 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import tarfile
+import tempfile
+import unittest
+
+from dirutility.open import compress
+from dirutility.open.compress import ParallelCompressor
+from dirutility.open.open import tardir
+
+
+class TestParallelCompressor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = b''.join(os.urandom(64) + b'dirutility ' * 100 for _ in range(100))
+
+    def compressed(self, codec, data, **kwargs):
+        fp = io.BytesIO()
+        with ParallelCompressor(fp, codec, block_size=10000, workers=4, **kwargs) as compressor:
+            for i in range(0, len(data), 3000):
+                compressor.write(data[i:i + 3000])
+        return fp.getvalue(), compressor.blocks
+
+    def test_codecs(self):
+        for codec, decompress in (('gz', gzip.decompress), ('bz2', bz2.decompress), ('xz', lzma.decompress)):
+            data, blocks = self.compressed(codec, self.data)
+            self.assertEqual(decompress(data), self.data)
+            self.assertEqual(len(blocks), -(-len(self.data) // 10000))
+
+    @unittest.skipIf(compress.zstandard is None, 'zstandard is not installed')
+    def test_zst(self):
+        data, blocks = self.compressed('zst', self.data)
+        reader = compress.zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True)
+        self.assertEqual(reader.read(), self.data)
+
+    @unittest.skipIf(compress.zstandard is None, 'zstandard is not installed')
+    def test_tardir_zst(self):
+        with tempfile.TemporaryDirectory() as temp:
+            archive = os.path.join(temp, 'archive.tar.zst')
+            with tardir(archive, mode='w:zst', abc='abc abc abc', kbs={'yoyo': 'yoyo ' * 100000}):
+                with open(archive, 'rb') as fp:
+                    reader = compress.zstandard.ZstdDecompressor().stream_reader(fp, read_across_frames=True)
+                    with tarfile.open(fileobj=reader, mode='r|') as tar:
+                        contents = {m.name: tar.extractfile(m).read() for m in tar if m.isfile()}
+            self.assertEqual(contents, {'abc': b'abc abc abc', 'kbs/yoyo': b'yoyo ' * 100000})
+
+    def test_blocks(self):
+        data, blocks = self.compressed('gz', self.data)
+        for i, (offset, compressed_offset) in enumerate(blocks):
+            end = blocks[i + 1][1] if i + 1 < len(blocks) else len(data)
+            self.assertEqual(gzip.decompress(data[compressed_offset:end]), self.data[offset:offset + 10000])
+
+    def test_empty(self):
+        self.assertEqual(gzip.decompress(self.compressed('gz', b'')[0]), b'')
+
+    def test_invalid_codec(self):
+        self.assertRaises(ValueError, ParallelCompressor, io.BytesIO(), 'rar')
+
+    def test_tardir(self):
+        with tempfile.TemporaryDirectory() as temp:
+            paths = {'abc': 'abc abc abc', 'kbs': {'haha': {}, 'yoyo': {'haha': 'yoyo ' * 100000}}}
+            for suffix in ('gz', 'bz2', 'xz'):
+                archive = os.path.join(temp, 'parallel.tar.' + suffix)
+                with tardir(archive, mode='w:' + suffix, parallel=True, workers=2, **paths):
+                    with tarfile.open(archive) as tar:
+                        self.assertEqual(tar.extractfile('abc').read(), b'abc abc abc')
+                        self.assertEqual(tar.extractfile('kbs/yoyo/haha').read(), b'yoyo ' * 100000)
+                        self.assertIn('kbs/haha', tar.getnames())
+
+
+if __name__ == '__main__':
+    unittest.main()
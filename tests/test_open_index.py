@@ -0,0 +1,131 @@
+import gzip
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from functools import partial
+from unittest import mock
+
+from dirutility.backup import ZipBackup
+from dirutility.error import StaleIndexError
+from dirutility.open import ArchiveIndex, clazz, compress
+from dirutility.open.compress import ParallelCompressor
+from dirutility.open.index import DECOMPRESSORS, index_path
+from dirutility.open.open import tardir
+from tests import directory
+
+
+class TestArchiveIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.paths = {
+            'abc': 'abc abc abc',
+            'empty': '',
+            'kbs': {'haha': {}, 'yoyo': {'haha': 'yoyo ' * 100000, 'noise': os.urandom(50000).hex()}}
+        }
+        self.expected = {'abc': b'abc abc abc', 'empty': b'', 'kbs/yoyo/haha': b'yoyo ' * 100000,
+                         'kbs/yoyo/noise': self.paths['kbs']['yoyo']['noise'].encode()}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def assertIndexed(self, archive):
+        index = ArchiveIndex(archive)
+        self.assertEqual(sorted(index.names()), sorted(self.expected))
+        self.assertNotIn('kbs/haha', index)
+        for name, data in self.expected.items():
+            self.assertEqual(index.read(name), data)
+        self.assertRaises(KeyError, index.read, 'missing')
+        return index
+
+    def test_tar(self):
+        for mode in ('w', 'w:gz', 'w:bz2', 'w:xz'):
+            archive = os.path.join(self.temp, 'single.tar' + mode[1:].replace(':', '.'))
+            with mock.patch.object(clazz, 'ParallelCompressor', partial(ParallelCompressor, block_size=4096)):
+                with tardir(archive, mode=mode, index=True, **self.paths):
+                    index = self.assertIndexed(archive)
+                    # Indexed archives are compressed in blocks even without parallel
+                    if mode == 'w':
+                        self.assertEqual(len(index.blocks), 1)
+                    else:
+                        self.assertGreater(len(index.blocks), 100)
+                    with tarfile.open(archive) as tar:
+                        self.assertEqual(tar.extractfile('kbs/yoyo/haha').read(), self.expected['kbs/yoyo/haha'])
+            self.assertFalse(os.path.exists(index_path(archive)))
+
+    def test_tar_parallel(self):
+        archive = os.path.join(self.temp, 'parallel.tar.gz')
+        with mock.patch.object(clazz, 'ParallelCompressor', partial(ParallelCompressor, block_size=4096)):
+            with tardir(archive, mode='w:gz', parallel=True, workers=2, index=True, **self.paths):
+                index = self.assertIndexed(archive)
+                self.assertGreater(len(index.blocks), 100)
+
+                # Members are read from the block containing their start, not from the start of the archive
+                seeks = []
+
+                class Reader(gzip.GzipFile):
+
+                    def seek(self, offset, whence=0):
+                        seeks.append(offset)
+                        return super().seek(offset, whence)
+
+                with mock.patch.dict(DECOMPRESSORS, gz=lambda fileobj: Reader(fileobj=fileobj, mode='rb')):
+                    for name, data in self.expected.items():
+                        self.assertEqual(index.read(name), data)
+                self.assertEqual(len(seeks), len(self.expected))
+                self.assertLess(max(seeks), 4096)
+
+    @unittest.skipIf(compress.zstandard is None, 'zstandard is not installed')
+    def test_tar_zst(self):
+        archive = os.path.join(self.temp, 'archive.tar.zst')
+        with mock.patch.object(clazz, 'ParallelCompressor', partial(ParallelCompressor, block_size=4096)):
+            with tardir(archive, mode='w:zst', index=True, **self.paths):
+                self.assertGreater(len(self.assertIndexed(archive).blocks), 100)
+
+    def test_stale(self):
+        archive = os.path.join(self.temp, 'archive.tar.gz')
+        with tardir(archive, mode='w:gz', index=True, **self.paths):
+            ArchiveIndex(archive)
+            stat = os.stat(archive)
+            os.utime(archive, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            self.assertRaises(StaleIndexError, ArchiveIndex, archive)
+
+    def test_zip(self):
+        for level in (None, 6):
+            archive = os.path.join(self.temp, 'archive{0}.zip'.format(level))
+            with tardir(archive, mode='w:zip', compress_level=level, temp=False, index=True, **self.paths):
+                self.assertIndexed(archive)
+            with open(index_path(archive)) as fp:
+                self.assertEqual(json.load(fp)['format'], 'zip')
+
+    def test_zip_backup(self):
+        source = os.path.join(self.temp, 'games')
+        shutil.copytree(directory, source)
+        zip_filename = ZipBackup(source, self.temp, compress_level=6, index=True).backup()
+        index = ArchiveIndex(zip_filename)
+        with zipfile.ZipFile(zip_filename) as zf:
+            self.assertEqual(sorted(index.names()), sorted(i.filename for i in zf.infolist() if not i.is_dir()))
+            for name in index.names():
+                self.assertEqual(index.read(name), zf.read(name))
+
+    def test_extract(self):
+        archive = os.path.join(self.temp, 'archive.tar.gz')
+        destination = os.path.join(self.temp, 'extracted')
+        with tardir(archive, mode='w:gz', index=True, **self.paths):
+            index = ArchiveIndex(archive)
+            path = index.extract('kbs/yoyo/haha', destination)
+            self.assertEqual(path, os.path.join(destination, 'kbs', 'yoyo', 'haha'))
+            with open(path, 'rb') as fp:
+                self.assertEqual(fp.read(), self.expected['kbs/yoyo/haha'])
+
+            index.members['../escape'] = index.members['abc']
+            self.assertRaises(ValueError, index.extract, '../escape', destination)
+            self.assertRaises(ValueError, index.extract, '/abc', destination)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import io
+import unittest
+import zipfile
+import zlib
+
+from dirutility.open.zipwrite import append_compressed
+
+
+def member(name, data, compress_type=zipfile.ZIP_DEFLATED):
+    zinfo = zipfile.ZipInfo(name, (2020, 1, 1, 0, 0, 0))
+    zinfo.compress_type = compress_type
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    if compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        data = compressor.compress(data) + compressor.flush()
+    zinfo.compress_size = len(data)
+    return zinfo, data
+
+
+class TestAppendCompressed(unittest.TestCase):
+
+    def setUp(self):
+        self.contents = {'a.txt': b'a' * 1000, 'dir/b.bin': bytes(range(256)) * 10, 'empty': b''}
+
+    def test_append(self):
+        fp = io.BytesIO()
+        with zipfile.ZipFile(fp, 'w') as zip_file:
+            zip_file.writestr('first.txt', b'written by zipfile')
+            append_compressed(zip_file, [member(name, data) for name, data in self.contents.items()])
+            append_compressed(zip_file, [member('stored.txt', b'stored', zipfile.ZIP_STORED)])
+            append_compressed(zip_file, [])
+            zip_file.writestr('last.txt', b'written by zipfile')
+
+        with zipfile.ZipFile(fp) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            self.assertEqual(zip_file.namelist(), ['first.txt', 'a.txt', 'dir/b.bin', 'empty', 'stored.txt',
+                                                   'last.txt'])
+            for name, data in self.contents.items():
+                self.assertEqual(zip_file.read(name), data)
+            self.assertEqual(zip_file.getinfo('stored.txt').compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zip_file.getinfo('a.txt').external_attr, 0o600 << 16)
+
+    def test_append_existing(self):
+        fp = io.BytesIO()
+        with zipfile.ZipFile(fp, 'w') as zip_file:
+            zip_file.writestr('first.txt', b'first')
+        with zipfile.ZipFile(fp, 'a') as zip_file:
+            append_compressed(zip_file, [member('a.txt', self.contents['a.txt'])])
+        with zipfile.ZipFile(fp) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            self.assertEqual(zip_file.read('a.txt'), self.contents['a.txt'])
+
+    def test_checks(self):
+        fp = io.BytesIO()
+        with zipfile.ZipFile(fp, 'w') as zip_file:
+            append_compressed(zip_file, [member('a.txt', b'a')])
+            with self.assertWarns(UserWarning):
+                append_compressed(zip_file, [member('a.txt', b'a')])
+            with zip_file.open('open.txt', 'w'):
+                self.assertRaises(ValueError, append_compressed, zip_file, [member('b.txt', b'b')])
+        self.assertRaises(ValueError, append_compressed, zip_file, [member('b.txt', b'b')])
+        with zipfile.ZipFile(fp) as zip_file:
+            self.assertRaises(ValueError, append_compressed, zip_file, [member('b.txt', b'b')])
+
+
+if __name__ == '__main__':
+    unittest.main()
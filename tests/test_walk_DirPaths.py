@@ -1,6 +1,9 @@
 import os
+import shutil
+import tempfile
 import unittest
 from datetime import datetime
+from unittest import mock
 from dirutility.walk import DirPaths
 from dirutility.walk.walk import md5_hash
 from tests import *
@@ -15,6 +18,26 @@ class TestWalk(unittest.TestCase):
         for i in paths:
             self.assertTrue(os.path.exists(i))
 
+    def test_DirPaths_multiprocess_matches_sequential(self):
+        paths = DirPaths(directory, parallelize=True, pool_size=2, to_exclude=False).walk()
+        expected = DirPaths(directory, to_exclude=False).walk()
+        self.assertEqual(sorted(paths), sorted(expected))
+
+    def test_DirPaths_threads(self):
+        paths = DirPaths(directory, parallelize='threads', pool_size=8, to_exclude=False).walk()
+        expected = DirPaths(directory, to_exclude=False).walk()
+        self.assertEqual(sorted(paths), sorted(expected))
+
+    def test_DirPaths_root_files_default_filters(self):
+        with tempfile.TemporaryDirectory() as temp:
+            os.mkdir(os.path.join(temp, 'a'))
+            for path in ('root.txt', os.path.join('a', 'x.txt'), '.DS_Store'):
+                open(os.path.join(temp, path), 'w').close()
+            expected = sorted(['root.txt', os.path.join('a', 'x.txt')])
+            for kwargs in ({}, {'engine': 'scandir'}, {'parallelize': True, 'pool_size': 2},
+                           {'parallelize': 'threads'}):
+                self.assertEqual(sorted(DirPaths(temp, **kwargs).walk()), expected)
+
     def test_DirPaths_sequential(self):
         paths = DirPaths(directory, full_paths=True, parallelize=False, console_stream=CONSOLE_STREAM).walk()
         for i in paths:
@@ -26,6 +49,61 @@ class TestWalk(unittest.TestCase):
         for i in paths:
             self.assertTrue(os.path.exists(i))
 
+    def test_DirPaths_scandir(self):
+        paths = DirPaths(directory, full_paths=True, engine='scandir', console_stream=CONSOLE_STREAM).walk()
+        expected = DirPaths(directory, full_paths=True, console_stream=CONSOLE_STREAM).walk()
+        self.assertEqual(sorted(paths), sorted(expected))
+
+    def test_DirPaths_scandir_filters(self):
+        paths = DirPaths(directory, engine='scandir', to_include=['2018-11-0'], max_level=2).walk()
+        expected = DirPaths(directory, to_include=['2018-11-0'], max_level=2).walk()
+        self.assertEqual(sorted(paths), sorted(expected))
+
+    def test_DirPaths_scandir_bottomup(self):
+        paths = DirPaths(directory, engine='scandir', topdown=False).walk()
+        expected = DirPaths(directory, topdown=False).walk()
+        self.assertEqual(paths, expected)
+
+    def test_DirPaths_iter_walk(self):
+        expected = DirPaths(directory, full_paths=True).walk()
+        for kwargs in ({}, {'engine': 'scandir'}, {'parallelize': True}, {'parallelize': 'threads'}):
+            dp = DirPaths(directory, full_paths=True, **kwargs)
+            self.assertEqual(sorted(dp.iter_walk()), sorted(expected))
+            self.assertEqual(len(dp), 0)
+
+    def test_DirPaths_iter_walk_batch(self):
+        batches = list(DirPaths(directory, engine='scandir').iter_walk(batch=True))
+        self.assertTrue(all(isinstance(b, list) for b in batches))
+        self.assertEqual(sorted(p for b in batches for p in b), sorted(DirPaths(directory).walk()))
+
+    def test_DirPaths_iter_walk_hash(self):
+        for path, _hash in DirPaths(directory, full_paths=True, hash_files=True).iter_walk(chunk_size=7):
+            self.assertEqual(_hash, md5_hash(path))
+
+    def test_DirPaths_pruning(self):
+        with tempfile.TemporaryDirectory() as temp:
+            source = os.path.join(temp, 'games')
+            shutil.copytree(directory, source)
+            open(os.path.join(source, '2018-11-08.json'), 'w').close()
+            everything = DirPaths(source, to_exclude=False).walk()
+            for kwargs in ({'max_level': 1}, {'max_level': 2}, {'to_exclude': ['2018-11-01']},
+                           {'filters': {0: {'exclude': ['2018-11-02']}}}, {'to_include': ['2018-11-0']}):
+                filters = DirPaths(source, **kwargs).filters
+                expected = sorted(DirPaths(source, **kwargs).walk())
+                # Files are only validated once their directory, the root included, passes the filters
+                if filters.validate(''):
+                    self.assertEqual(expected, sorted(p for p in everything if filters.validate(p)))
+                self.assertEqual(sorted(DirPaths(source, engine='scandir', **kwargs).walk()), expected)
+                for parallelize in ('threads', True):
+                    self.assertEqual(sorted(DirPaths(source, parallelize=parallelize, **kwargs).walk()), expected)
+
+    def test_DirPaths_pruning_skips_excluded(self):
+        with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+            DirPaths(directory, engine='scandir', to_exclude=['2018-11-01']).walk()
+        scanned = [str(c.args[0]) for c in scandir.call_args_list]
+        self.assertTrue(scanned)
+        self.assertFalse(any('2018-11-01' in p for p in scanned))
+
     def test_DirPaths_hash(self):
         paths = DirPaths(directory, full_paths=True, parallelize=False, hash_files=True,
                          console_stream=CONSOLE_STREAM).walk()
@@ -42,6 +120,47 @@ class TestWalk(unittest.TestCase):
             self.assertTrue(os.path.exists(path))
             self.assertTrue(isinstance(created_at, datetime))
 
+    def test_DirPaths_created_at_stat(self):
+        dp = DirPaths(directory, full_paths=True)
+        dp.walk()
+        expected = dp.creation_dates(sort=True)
+        dp.walk(stat=True)
+        self.assertEqual(sorted(dp.creation_dates(sort=False)), sorted(expected))
+        self.assertEqual([d for p, d in dp.creation_dates(sort=True)], [d for p, d in expected])
+
+    def test_DirPaths_newest(self):
+        dp = DirPaths(directory, full_paths=True)
+        newest = dp.newest(5)
+        self.assertEqual(len(newest), 5)
+        self.assertEqual([d for p, d in newest], [d for p, d in dp.creation_dates(sort=True)[:5]])
+
+        # Already walked plain path lists are stat'd instead
+        dp.walk()
+        self.assertEqual([d for p, d in dp.newest(5)], [d for p, d in newest])
+
+    def test_DirPaths_created_at_relative(self):
+        dp = DirPaths(directory)
+        paths = dp.walk()
+        self.assertFalse(os.path.isabs(paths[0]))
+        expected = DirPaths(directory, full_paths=True).newest(len(paths))
+        expected = [(os.path.relpath(p, directory), d) for p, d in expected]
+        self.assertEqual(sorted(dp.creation_dates(sort=False)), sorted(expected))
+        self.assertEqual([d for p, d in dp.newest(5)], [d for p, d in expected[:5]])
+
+    def test_DirPaths_newest_unreadable(self):
+        with tempfile.TemporaryDirectory() as temp:
+            for name in ('file.txt', 'removed.txt'):
+                open(os.path.join(temp, name), 'w').close()
+            os.symlink(os.path.join(temp, 'missing.txt'), os.path.join(temp, 'broken'))
+            expected = sorted(os.path.join(temp, name) for name in ('broken', 'file.txt'))
+
+            dp = DirPaths(temp, full_paths=True)
+            dp.walk()
+            os.remove(os.path.join(temp, 'removed.txt'))
+            self.assertEqual(sorted(p for p, d in dp.newest(5)), expected)
+            self.assertEqual(sorted(p for p, d in dp.creation_dates()), expected)
+            self.assertEqual(sorted(p for p, d in DirPaths(temp, full_paths=True).newest(5)), expected)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from dirutility.walk import DirPaths
+from dirutility.walk.cache import HashCache
+from dirutility.walk.walk import md5_hash
+from tests import directory
+
+
+class TestHashCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp, 'games')
+        shutil.copytree(directory, self.root)
+        self.db = os.path.join(self.temp, 'hashes.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def walk(self):
+        return dict(DirPaths(self.root, full_paths=True, hash_files=True, hash_cache=self.db).walk())
+
+    def test_cache_populated(self):
+        hashes = self.walk()
+        with HashCache(self.db) as cache:
+            self.assertEqual(len(cache), len(hashes))
+            cached, misses = cache.lookup(list(hashes))
+        self.assertEqual(cached, hashes)
+        self.assertEqual(misses, [])
+
+    def test_cache_hit(self):
+        self.walk()
+        with HashCache(self.db) as cache:
+            cache._conn.execute("UPDATE hashes SET digest = 'cached'")
+            cache._conn.commit()
+        self.assertTrue(all(_hash == 'cached' for _hash in self.walk().values()))
+
+    def test_modified_file(self):
+        hashes = self.walk()
+        path = sorted(hashes)[0]
+        with open(path, 'a') as fp:
+            fp.write('modified')
+        rehashed = self.walk()
+        self.assertEqual(rehashed[path], md5_hash(path))
+        self.assertNotEqual(rehashed[path], hashes[path])
+
+    def test_evict_deleted(self):
+        hashes = self.walk()
+        os.remove(sorted(hashes)[0])
+        self.walk()
+        with HashCache(self.db) as cache:
+            self.assertEqual(len(cache), len(hashes) - 1)
+
+    def test_iter_walk(self):
+        hashes = self.walk()
+        streamed = dict(DirPaths(self.root, full_paths=True, hash_files=True, hash_cache=self.db).iter_walk())
+        self.assertEqual(streamed, hashes)
+
+
+if __name__ == '__main__':
+    unittest.main()
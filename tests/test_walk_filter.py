@@ -0,0 +1,86 @@
+import os
+import unittest
+
+from dirutility.walk import DirPaths
+from dirutility.walk.filter import PathFilters, PatternFilters, compile_patterns
+from tests import directory
+
+
+class TestCompilePatterns(unittest.TestCase):
+
+    def test_none(self):
+        self.assertIsNone(compile_patterns(None))
+        self.assertIsNone(compile_patterns([]))
+
+    def test_substring(self):
+        pattern = compile_patterns(['abc', 'ab', 'X.Y', 2007])
+        self.assertTrue(pattern.search('--ab--'))
+        self.assertTrue(pattern.search('x.y'))
+        self.assertTrue(pattern.search('projects 2007'))
+        self.assertFalse(pattern.search('xzy'))
+        self.assertFalse(pattern.search('a-b'))
+
+
+class TestPathFilters(unittest.TestCase):
+
+    def test_exclude(self):
+        filters = PathFilters(to_exclude=['.json', 'TEMP'], max_level=10)
+        self.assertFalse(filters.validate(os.path.join('a', 'b.JSON')))
+        self.assertFalse(filters.validate(os.path.join('temp', 'b.txt')))
+        self.assertTrue(filters.validate(os.path.join('a', 'b.txt')))
+
+    def test_include(self):
+        filters = PathFilters(to_include=['2018-11-01'], max_level=10)
+        self.assertTrue(filters.validate(os.path.join('2018-11-01', 'a.json')))
+        self.assertFalse(filters.validate(os.path.join('2018-11-02', 'a.json')))
+
+    def test_level_filters(self):
+        filters = PathFilters(filters={0: {'include': {2018}}, 1: {'exclude': {'temp'}}}, max_level=10)
+        self.assertTrue(filters.validate(os.path.join('2018', 'docs', 'a.txt')))
+        self.assertFalse(filters.validate(os.path.join('2017', 'docs', 'a.txt')))
+        self.assertFalse(filters.validate(os.path.join('2018', 'Temp Files', 'a.txt')))
+
+
+class TestPatternFilters(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.patterns = PatternFilters(['# comment', '**/*.log', 'build/', '!keep.log', '/docs/*.md', 'a/**/z', 'tmp'])
+
+    def test_glob(self):
+        self.assertTrue(self.patterns.excluded('x.log'))
+        self.assertTrue(self.patterns.excluded(os.path.join('a', 'b', 'x.log')))
+        self.assertFalse(self.patterns.excluded('x.txt'))
+
+    def test_negation(self):
+        self.assertFalse(self.patterns.excluded(os.path.join('a', 'keep.log')))
+
+    def test_directory_only(self):
+        self.assertTrue(self.patterns.excluded('build', is_dir=True))
+        self.assertFalse(self.patterns.excluded('build'))
+        self.assertTrue(self.patterns.excluded(os.path.join('src', 'build', 'main.c')))
+
+    def test_excluded_parent(self):
+        # Files can't be re-included within an excluded directory
+        self.assertTrue(self.patterns.excluded(os.path.join('build', 'keep.log')))
+
+    def test_anchored(self):
+        self.assertTrue(self.patterns.excluded(os.path.join('docs', 'index.md')))
+        self.assertFalse(self.patterns.excluded(os.path.join('src', 'docs', 'index.md')))
+        self.assertTrue(self.patterns.excluded(os.path.join('a', 'b', 'c', 'z')))
+
+    def test_rules_dropped_when_descending(self):
+        rules = self.patterns._directory('src')[1]
+        self.assertNotIn('/docs/*.md', [r.pattern for r in rules])
+        self.assertIn('/docs/*.md', [r.pattern for r in self.patterns._directory('docs')[1]])
+
+    def test_DirPaths_patterns(self):
+        everything = DirPaths(directory, to_exclude=False).walk()
+        paths = DirPaths(directory, patterns='2018-11-01/\n*5.json\n!2018020225.json').walk()
+        expected = [p for p in everything if not p.startswith('2018-11-01') and
+                    (not p.endswith('5.json') or p.endswith('2018020225.json'))]
+        self.assertEqual(sorted(paths), sorted(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import unittest
+
+from dirutility.walk import DirPaths, DirTree
+from dirutility.walk.paths import CompactPaths
+from tests import directory
+
+
+class TestCompactPaths(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.paths = [os.path.join(os.sep, 'a', 'b', 'x.txt'), os.path.join(os.sep, 'a', 'b', 'y.txt'),
+                     os.path.join(os.sep, 'a', 'z.txt'), 'relative.txt']
+        cls.compact = CompactPaths(cls.paths)
+
+    def test_iter(self):
+        self.assertEqual(len(self.compact), 4)
+        self.assertEqual(list(self.compact), self.paths)
+        self.assertEqual(len(self.compact.directories()), 3)
+
+    def test_contains(self):
+        for path in self.paths:
+            self.assertIn(path, self.compact)
+        self.assertNotIn(os.path.join(os.sep, 'a', 'b', 'z.txt'), self.compact)
+        self.assertNotIn(os.path.join(os.sep, 'c', 'x.txt'), self.compact)
+
+        # Paths added after the index is built are found as well
+        compact = CompactPaths(self.paths)
+        self.assertNotIn('new.txt', compact)
+        compact.add('new.txt')
+        self.assertIn('new.txt', compact)
+
+    def test_contains_index(self):
+        # Shared basenames across directories and basenames that are prefixes of each other
+        paths = [os.path.join(d, n) for d in ('a', 'ab', os.path.join('a', 'b'), '') for n in ('x', 'xy', 'x.txt', 'y')]
+        compact = CompactPaths(paths[::2])
+        for path in paths:
+            self.assertEqual(path in compact, path in paths[::2], path)
+        self.assertNotIn(os.path.join('a', 'x.tx'), compact)
+        self.assertEqual(compact._index.typecode, 'I')
+        self.assertEqual(len(compact._index), len(paths[::2]))
+
+    def test_difference(self):
+        other = CompactPaths(self.paths[1:3])
+        self.assertEqual(list(self.compact - other), [self.paths[0], self.paths[3]])
+        self.assertEqual(list(self.compact.difference(self.paths)), [])
+
+    def test_DirPaths(self):
+        expected = DirPaths(directory, full_paths=True).walk()
+        compact = DirPaths(directory, full_paths=True).walk(compact=True)
+        self.assertIsInstance(compact, CompactPaths)
+        self.assertEqual(list(compact), expected)
+        self.assertRaises(ValueError, DirPaths(directory).walk, stat=True, compact=True)
+
+    def test_DirTree(self):
+        expected = DirPaths(directory, to_exclude=False).walk()
+        self.assertEqual(sorted(DirTree(directory).paths()), sorted(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
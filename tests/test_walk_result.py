@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from dirutility.walk import DirPaths
+from dirutility.walk.result import WalkResult, file_batch
+from tests import directory
+
+
+class TestWalkResult(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.root = tempfile.mkdtemp()
+        for i, size in enumerate((30, 10, 20)):
+            with open(os.path.join(cls.root, 'file_{0}.txt'.format(i)), 'wb') as fp:
+                fp.write(b'x' * size)
+            os.utime(os.path.join(cls.root, 'file_{0}.txt'.format(i)), ns=(i * 10 ** 9, i * 10 ** 9))
+        cls.result = DirPaths(cls.root, to_exclude=False).walk(stat=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.root)
+
+    def test_columns(self):
+        self.assertIsInstance(self.result, WalkResult)
+        self.assertEqual(len(self.result), 3)
+        for i, path in enumerate(self.result):
+            stat = os.stat(os.path.join(self.root, path))
+            self.assertEqual(self.result.size[i], stat.st_size)
+            self.assertEqual(self.result.mtime_ns[i], stat.st_mtime_ns)
+            self.assertEqual(self.result.inode[i], stat.st_ino)
+            self.assertEqual(self.result.mode[i], stat.st_mode)
+
+    def test_sort(self):
+        self.assertEqual(list(self.result.sort('size').size), [10, 20, 30])
+        self.assertEqual(list(self.result.sort('mtime_ns', reverse=True)),
+                         ['file_2.txt', 'file_1.txt', 'file_0.txt'])
+
+    def test_filter(self):
+        self.assertEqual(sorted(self.result.filter(min_size=15)), ['file_0.txt', 'file_2.txt'])
+        self.assertEqual(list(self.result.filter(max_size=25, newer_than=2 * 10 ** 9)), ['file_2.txt'])
+        self.assertEqual(self.result.total_size(), 60)
+
+    def test_engines(self):
+        expected = DirPaths(directory, to_exclude=False).walk()
+        for kwargs in ({}, {'parallelize': True, 'pool_size': 2}, {'parallelize': 'threads'}):
+            result = DirPaths(directory, full_paths=True, to_exclude=False, **kwargs).walk(stat=True)
+            self.assertEqual(len(result), len(expected))
+            row = result.row(0)
+            self.assertEqual(row['size'], os.path.getsize(row['path']))
+
+    def test_broken_symlink(self):
+        with tempfile.TemporaryDirectory() as temp:
+            with open(os.path.join(temp, 'file.txt'), 'wb') as fp:
+                fp.write(b'x' * 10)
+            os.symlink(os.path.join(temp, 'missing.txt'), os.path.join(temp, 'broken'))
+            expected = sorted(DirPaths(temp).walk())
+            self.assertEqual(expected, ['broken', 'file.txt'])
+            for kwargs in ({}, {'parallelize': True, 'pool_size': 2}, {'parallelize': 'threads'}):
+                result = DirPaths(temp, **kwargs).walk(stat=True)
+                self.assertEqual(sorted(result), expected)
+                self.assertEqual(result.sort('path').size[1], 10)
+
+            # Files removed after they were listed are left out
+            result = file_batch([(os.path.join(temp, name), os.path.join(temp, name)) for name in
+                                 ('file.txt', 'removed.txt')], stat=True)
+            self.assertEqual(list(result), [os.path.join(temp, 'file.txt')])
+
+
+if __name__ == '__main__':
+    unittest.main()
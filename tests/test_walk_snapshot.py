@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from dirutility.walk import DirPaths
+from dirutility.walk.snapshot import Snapshot
+from tests import directory
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp, 'games')
+        shutil.copytree(directory, self.root)
+        self.file = os.path.join(self.temp, 'snapshot.json.gz')
+
+        # Age every directory so that unchanged listings are reused
+        for root, dirs, files in os.walk(self.root):
+            os.utime(root, ns=(0, 0))
+        self.paths = sorted(DirPaths(self.root).walk())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_save_load(self):
+        snapshot = DirPaths(self.root).snapshot(self.file)
+        loaded = Snapshot.load(self.file)
+        self.assertEqual(len(loaded), len(self.paths))
+        self.assertEqual(sorted(loaded), sorted(snapshot))
+        self.assertEqual(loaded.roots, snapshot.roots)
+
+    def test_no_changes(self):
+        DirPaths(self.root).snapshot(self.file)
+        self.assertEqual(DirPaths(self.root).changes(self.file), {'added': set(), 'removed': set(), 'modified': set()})
+
+    def test_changes(self):
+        DirPaths(self.root).snapshot(self.file)
+        removed, modified = self.paths[0], self.paths[-1]
+        added = os.path.join(os.path.dirname(removed), 'new.json')
+        os.remove(os.path.join(self.root, removed))
+        with open(os.path.join(self.root, added), 'w') as fp:
+            fp.write('{}')
+        with open(os.path.join(self.root, modified), 'a') as fp:
+            fp.write(' ')
+
+        changes = DirPaths(self.root).changes(self.file, verify_files=True)
+        self.assertEqual(changes, {'added': {added}, 'removed': {removed}, 'modified': {modified}})
+
+        # The updated snapshot was saved in place of the old one
+        self.assertEqual(DirPaths(self.root).changes(self.file)['added'], set())
+
+    def test_unchanged_directories_reused(self):
+        DirPaths(self.root).snapshot(self.file)
+        modified = self.paths[-1]
+        with open(os.path.join(self.root, modified), 'a') as fp:
+            fp.write(' ')
+        os.utime(os.path.join(self.root, os.path.dirname(modified)), ns=(0, 0))
+
+        self.assertEqual(DirPaths(self.root).changes(self.file, save=False)['modified'], set())
+        self.assertEqual(DirPaths(self.root).changes(self.file, verify_files=True)['modified'], {modified})
+
+    def test_touched_files_with_hashes(self):
+        DirPaths(self.root, hash_files=True).snapshot(self.file)
+        touched = os.path.join(self.root, self.paths[0])
+        os.utime(touched, ns=(1, 1))
+        changes = DirPaths(self.root, hash_files=True, full_paths=True).changes(self.file, verify_files=True)
+        self.assertEqual(changes['modified'], set())
+
+
+if __name__ == '__main__':
+    unittest.main()